@@ -0,0 +1,222 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+
+import numpy as np
+
+import player_registry
+
+# every scenario is one game with a fixed seed; a sweep changes one value of
+# the base scenario at a time. "stalls" are stalls to visit, "obstacles" the
+# other stalls. Engine scenarios play DefaultPlayers only, team scenarios a
+# game of a single team
+TIERS = {
+    "smoke": {
+        "turns": 20,
+        "base": {"stalls": 20, "obstacles": 20, "players": 6, "theta": 2},
+        "sweeps": {"stalls": [2, 50], "obstacles": [0, 50], "players": [6, 50], "theta": [1, 3]},
+        "team_turns": 5,
+        "team_base": {"stalls": 3, "obstacles": 3, "players": 6, "theta": 2},
+        "team_sweeps": {},
+    },
+    "standard": {
+        "turns": 200,
+        "base": {"stalls": 100, "obstacles": 100, "players": 6, "theta": 2},
+        "sweeps": {"stalls": [2, 100, 500, 1000], "obstacles": [0, 100, 500, 1000], "players": [6, 100, 1000],
+                   "theta": [1, 2, 3]},
+        "team_turns": 50,
+        "team_base": {"stalls": 20, "obstacles": 20, "players": 6, "theta": 2},
+        "team_sweeps": {},
+    },
+    "full": {
+        "turns": 500,
+        "base": {"stalls": 100, "obstacles": 100, "players": 6, "theta": 2},
+        "sweeps": {"stalls": [2, 100, 500, 1000, 2000, 2200], "obstacles": [0, 100, 500, 1000, 2000, 2200],
+                   "players": [6, 100, 500, 1000], "theta": [1, 2, 3]},
+        "team_turns": 100,
+        "team_base": {"stalls": 20, "obstacles": 20, "players": 6, "theta": 2},
+        "team_sweeps": {"stalls": [100], "players": [18], "theta": [1, 3]},
+    },
+}
+
+TEAMS = player_registry.teams()
+
+# a headless launch of main.py with one DefaultPlayer should take less than
+# STARTUP_BUDGET seconds, and import none of the modules in HEAVY_MODULES
+STARTUP_BUDGET = 1.5
+STARTUP_RUNS = {"smoke": 3, "standard": 5, "full": 10}
+STARTUP_ARGS = ["-g", "False", "-ns", "2", "-nv", "1", "-T", "10", "-p", "d", "-l", "off"]
+HEAVY_MODULES = ["tkinter", "Pmw", "rvo2", "players.team_"]
+
+
+def scenarios(tier, teams=TEAMS):
+    # the scenarios of a tier, without duplicates, engine scenarios first
+    spec = TIERS[tier]
+    result = []
+    seen = set()
+
+    def add(kind, team, base, turns, axis=None, value=None):
+        scenario = dict(base, kind=kind, team=team, turns=turns)
+        if axis is not None:
+            scenario[axis] = value
+        key = tuple(sorted(scenario.items()))
+        if key not in seen:
+            seen.add(key)
+            scenario["name"] = ("team " + team if kind == "team" else kind) + " " + \
+                ", ".join(name + " " + str(scenario[name]) for name in ("stalls", "obstacles", "players", "theta"))
+            result.append(scenario)
+
+    add("engine", "d", spec["base"], spec["turns"])
+    for axis, values in spec["sweeps"].items():
+        for value in values:
+            add("engine", "d", spec["base"], spec["turns"], axis, value)
+    for team in teams:
+        add("team", team, spec["team_base"], spec["team_turns"])
+        for axis, values in spec["team_sweeps"].items():
+            for value in values:
+                add("team", team, spec["team_base"], spec["team_turns"], axis, value)
+    return result
+
+
+def play_scenario(scenario, seed):
+    # play one scenario in this process and measure it
+    from simulation import GameConfig, Simulation
+
+    start = time.perf_counter()
+    sim = Simulation(GameConfig(no_of_stalls=scenario["stalls"] + scenario["obstacles"], no_to_visit=scenario["stalls"],
+                                theta=scenario["theta"], players=[scenario["team"]] * scenario["players"], seed=seed))
+    setup = time.perf_counter() - start
+    sim.run(max_turns=scenario["turns"])
+    turns = sim.iteration
+    sim.close()
+
+    result = {"seed": seed, "T": sim.T, "setup_time": setup, "tsp_time": sim.tsp_time, "played_turns": turns, "time": sim.elapsed,
+              "turns_per_second": turns / sim.elapsed if sim.elapsed > 0 else 0.0,
+              "ms_per_turn": 1000 * sim.elapsed / turns if turns > 0 else 0.0}
+    if scenario["kind"] == "team":
+        # time the team itself spends deciding, per player and turn
+        result["decision_ms_per_player_turn"] = 1000 * sum(sim.decision_time) / (turns * sim.num_players) \
+            if turns > 0 else 0.0
+        result["timeouts"] = sum(sim.budget.violations)
+    return result
+
+
+def _scenario_worker(scenario, seed, connection):
+    try:
+        result = play_scenario(scenario, seed)
+    except Exception:
+        result = {"seed": seed, "error": traceback.format_exc()}
+    connection.send(result)
+    connection.close()
+
+
+def run_scenario(scenario, seed, timeout):
+    # every scenario gets a fresh process, so scenarios do not share caches or
+    # memory, and a scenario that takes longer than timeout seconds is stopped
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_scenario_worker, args=(scenario, seed, sender), daemon=True)
+    process.start()
+    sender.close()
+    if receiver.poll(timeout if timeout > 0 else None):
+        try:
+            result = receiver.recv()
+        except EOFError:
+            result = {"seed": seed, "error": "Benchmark process exited with code " + str(process.exitcode)}
+    else:
+        process.terminate()
+        result = {"seed": seed, "error": "Timed out after " + str(timeout) + " seconds"}
+    process.join()
+    return dict(scenario, **result)
+
+
+def startup(runs):
+    # wall clock time of complete headless launches, and the heavy modules
+    # that such a launch imported; like `python main.py`, the probe puts the
+    # directory of main.py first on sys.path, from any current directory
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+    probe = "import os, runpy, sys\n" \
+        "sys.argv = sys.argv[1:]\n" \
+        "sys.path.insert(0, os.path.dirname(sys.argv[0]))\n" \
+        "try:\n" \
+        "    runpy.run_path(sys.argv[0], run_name='__main__')\n" \
+        "finally:\n" \
+        "    sys.stderr.write('MODULES ' + ' '.join(sorted(sys.modules)) + '\\n')\n"
+    times = []
+    modules = set()
+    with tempfile.TemporaryDirectory() as directory:
+        for run in range(runs):
+            start = time.perf_counter()
+            process = subprocess.run([sys.executable, "-c", probe, script] + STARTUP_ARGS +
+                                     ["-o", os.path.join(directory, str(run))], capture_output=True, text=True)
+            times.append(time.perf_counter() - start)
+            if process.returncode != 0:
+                return {"name": "startup", "kind": "startup", "error": process.stderr + process.stdout}
+            for line in process.stderr.splitlines():
+                if line.startswith("MODULES "):
+                    modules.update(name for name in line.split()[1:]
+                                   if any(name.startswith(heavy) for heavy in HEAVY_MODULES))
+
+    median = float(np.median(times))
+    return {"name": "startup", "kind": "startup", "runs": runs, "times": times, "median_time": median,
+            "budget": STARTUP_BUDGET, "within_budget": median <= STARTUP_BUDGET, "heavy_modules": sorted(modules)}
+
+
+def format_result(result):
+    if "error" in result:
+        return result["name"].ljust(60) + "ERROR " + result["error"].strip().splitlines()[-1]
+    if result["kind"] == "startup":
+        return result["name"].ljust(60) + ("%.3fs median of %d" % (result["median_time"], result["runs"])).rjust(24) + \
+            (" within" if result["within_budget"] else " OVER") + " the %.1fs budget" % result["budget"] + \
+            ("" if not result["heavy_modules"] else ", imported " + " ".join(result["heavy_modules"]))
+    text = result["name"].ljust(60) + ("setup %.2fs" % result["setup_time"]).rjust(14) + \
+        ("tsp %.2fs" % result["tsp_time"]).rjust(12) + \
+        ("%.1f turns/s" % result["turns_per_second"]).rjust(18) + ("%.3f ms/turn" % result["ms_per_turn"]).rjust(18)
+    if "decision_ms_per_player_turn" in result:
+        text += ("%.3f ms/player turn" % result["decision_ms_per_player_turn"]).rjust(24)
+    return text
+
+
+def run_benchmark(tier, seed, output, teams=TEAMS, timeout=600):
+    start = time.perf_counter()
+    results = [startup(STARTUP_RUNS[tier])]
+    print(format_result(results[0]), flush=True)
+    for scenario in scenarios(tier, teams):
+        result = run_scenario(scenario, seed, timeout)
+        print(format_result(result), flush=True)
+        results.append(result)
+
+    report = {
+        "tier": tier,
+        "seed": seed,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {"platform": platform.platform(), "processor": platform.processor() or platform.machine(),
+                    "cpu_count": os.cpu_count(), "python": platform.python_version(), "numpy": np.__version__},
+        "time": time.perf_counter() - start,
+        "scenarios": results,
+    }
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print("Elapsed Time: " + str(round(report["time"], 2)) + " seconds, " +
+          str(sum(1 for result in results if "error" in result)) + " scenarios failed")
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tier", "-t", default="standard", choices=list(TIERS),
+                        help="smoke takes seconds, standard a few minutes and full much longer")
+    parser.add_argument("--seed", "-s", default=1, help="Seed of every scenario")
+    parser.add_argument("--teams", default=TEAMS, nargs="*", help="Teams to time, none to only time the engine")
+    parser.add_argument("--output", "-o", default=None, help="JSON file for the results, benchmark_<tier>.json by default")
+    parser.add_argument("--timeout", default=600, help="Seconds after which a scenario is stopped, 0 for no limit")
+    args = parser.parse_args()
+
+    run_benchmark(args.tier, int(args.seed), args.output or "benchmark_" + args.tier + ".json", list(args.teams),
+                  float(args.timeout))
@@ -0,0 +1,55 @@
+import numpy as np
+
+
+def check_collision_batch(x1, y1, new_x1, new_y1, x2, y2, new_x2, new_y2):
+    """Moving circle collision test for many pairs at once.
+
+    Every argument is an array with one entry per pair: the start and end
+    positions of the first and of the second player. Returns a boolean mask
+    that is True where the two players come within 0.5 units of each other
+    during the move. This is the batched form of Simulation.check_collision
+    and gives the same answer for every pair, including the A == 0 and
+    D == 0 cases.
+    """
+    x1 = np.asarray(x1, dtype=np.float64)
+    y1 = np.asarray(y1, dtype=np.float64)
+    x2 = np.asarray(x2, dtype=np.float64)
+    y2 = np.asarray(y2, dtype=np.float64)
+
+    vx = np.asarray(new_x1, dtype=np.float64) - x1
+    vy = np.asarray(new_y1, dtype=np.float64) - y1
+    wx = np.asarray(new_x2, dtype=np.float64) - x2
+    wy = np.asarray(new_y2, dtype=np.float64) - y2
+
+    # same expressions, evaluated in the same order, as the scalar version
+    A = vx**2 + wx**2 + vy**2 + wy**2 - 2*vx*wx - 2*vy*wy
+    B = 2*x1*vx - 2*x2*vx - 2*x1*wx + 2*x2*wx + \
+        2*y1*vy - 2*y2*vy - 2*y1*wy + 2*y2*wy
+    C = x1**2 + x2**2 + y1**2 + y2**2 - 2*x1*x2 - 2*y1*y2 - 0.25
+
+    D = B**2 - 4*A*C
+
+    linear = A == 0
+    hit = np.zeros(A.shape, dtype=bool)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # A == 0: the relative motion is zero, the distance only depends on C
+        # (B == 0) or is linear in t
+        constant = linear & (B == 0)
+        hit |= constant & (C == 0)
+        root = (-1 * C) / B
+        hit |= linear & ~constant & (root >= 0) & (root <= 1)
+
+        # D == 0: the paths just touch
+        quadratic = ~linear
+        root = (-1 * B) / (2 * A)
+        hit |= quadratic & (D == 0) & (root >= 0) & (root <= 1)
+
+        # D > 0: enter or leave the 0.5 radius during the move
+        crossing = quadratic & (D > 0)
+        sqrt_D = np.sqrt(np.where(crossing, D, 0))
+        root1 = (-1 * B + sqrt_D) / (2 * A)
+        root2 = (-1 * B - sqrt_D) / (2 * A)
+        hit |= crossing & (((root1 > 0) & (root1 <= 1)) | ((root2 > 0) & (root2 <= 1)))
+
+    return hit
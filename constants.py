@@ -5,4 +5,6 @@ vis_height = 100 * 8
 
 stall_size = 2
 
-timeout = 60 * 10
\ No newline at end of file
+# seconds a player may spend deciding its moves in a whole game, and in one turn
+timeout = 60 * 10
+turn_timeout = 10
\ No newline at end of file
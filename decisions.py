@@ -0,0 +1,369 @@
+import multiprocessing
+import os
+import pickle
+import random
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+
+import numpy as np
+
+from player_state import SnapshotError, dump_player
+from spatial import NeighbourGrid, StaticGrid, lookup
+from time_budget import TimeBudget
+
+# how the players decide their moves: one after the other in the engine, in
+# worker threads (only faster for players that release the GIL) or in worker
+# processes that hold the players for the whole game
+SERIAL = "serial"
+THREADS = "threads"
+PROCESSES = "processes"
+MODES = [SERIAL, THREADS, PROCESSES]
+
+# in the parallel modes every player draws from random streams of its own:
+# while one of its methods runs, the functions of the random and numpy.random
+# modules (random.random, np.random.rand, np.random.seed, ...) use the
+# player's generators instead of the shared ones, so the order in which
+# players happen to run does not change what they draw. Only these module
+# functions are covered: names bound before the game (from random import
+# random), generators a player makes itself (np.random.default_rng()) and
+# players whose moves depend on the clock (team 1 stops its search after a
+# number of seconds) can still play differently from one run to the next
+_local = threading.local()
+_lock = threading.Lock()
+_users = 0
+_functions = {}
+
+
+class Stream():
+    # the random generators of one player
+    def __init__(self, seed):
+        self.random = random.Random(seed)
+        self.numpy = np.random.RandomState(seed % 2 ** 32)
+
+    def getstate(self):
+        return self.random.getstate(), self.numpy.get_state()
+
+    def setstate(self, state):
+        self.random.setstate(state[0])
+        self.numpy.set_state(state[1])
+
+
+def _dispatch(name, generator, default):
+    def function(*args, **kwargs):
+        stream = getattr(_local, "stream", None)
+        return getattr(getattr(stream, generator) if stream is not None else default, name)(*args, **kwargs)
+    return function
+
+
+def _use_streams():
+    global _users
+    with _lock:
+        if _users == 0:
+            for module, generator, kind in [(random, "random", random.Random),
+                                            (np.random, "numpy", np.random.RandomState)]:
+                for name in module.__all__:
+                    function = getattr(module, name, None)
+                    default = getattr(function, "__self__", None)
+                    if name == "seed" and module is np.random:
+                        # a function of its own that seeds the shared RandomState
+                        default = np.random.mtrand._rand
+                    if isinstance(default, kind):
+                        _functions[module, name] = function
+                        setattr(module, name, _dispatch(name, generator, default))
+        _users += 1
+
+
+def _release_streams():
+    global _users
+    with _lock:
+        _users -= 1
+        if _users == 0:
+            for (module, name), function in _functions.items():
+                setattr(module, name, function)
+            _functions.clear()
+
+
+class _Deferred():
+    # stands in for a player in the engine: what the engine tells the player
+    # after the decision phase is kept and told right before its next decision
+    def __init__(self):
+        self.pending = []
+
+    def encounter_obstacle(self):
+        self.pending.append(("encounter_obstacle",))
+
+    def collect_item(self, stall_id):
+        self.pending.append(("collect_item", stall_id))
+
+
+def _decide(player, stream, pending, call, pos_x, pos_y, look):
+    # tell the player what happened since its last decision, then let it decide
+    # within call, a time_budget call; None if call is None, otherwise the
+    # action, the new position, the seconds taken and the seconds of the lookup
+    previous = getattr(_local, "stream", None)
+    _local.stream = stream
+    try:
+        for name, *args in pending:
+            getattr(player, name)(*args)
+        if call is None:
+            return None
+
+        start_time = time.perf_counter()
+        action, new_pos_x, new_pos_y = None, pos_x, pos_y
+        lookup_time = 0.0
+        with call:
+            action = player.get_action(pos_x, pos_y)
+            if action == 'lookup' or action == 'lookup move':
+                lookup_start = time.perf_counter()
+                other_players, stalls = look()
+                lookup_time = time.perf_counter() - lookup_start
+                player.pass_lookup_info(other_players, stalls)
+            if action == 'move' or action == 'lookup move':
+                new_pos_x, new_pos_y = player.get_next_move()
+        return action, new_pos_x, new_pos_y, time.perf_counter() - start_time, lookup_time
+    finally:
+        _local.stream = previous
+
+
+class _Capture():
+    # stdout of a worker process: what each player printed this turn
+    def __init__(self):
+        self.player = 0
+        self.texts = {}
+
+    def write(self, text):
+        self.texts.setdefault(self.player, []).append(text)
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+
+def _worker(connection, players, streams, teams, obstacles, radius, budget):
+    # a worker process: plays the players with indices in players (a dict)
+    # until it is told to stop; teams are the team names of all players,
+    # budget holds the arguments of a TimeBudget and the seconds every
+    # player has used so far
+    _use_streams()
+    obstacle_grid = StaticGrid(obstacles)
+    n, per_call, per_game, clock, preempt, used = budget
+    budget = TimeBudget(n, per_call, per_game, clock, preempt)
+    budget.used = used
+    capture = _Capture()
+    with redirect_stdout(capture):
+        while True:
+            message = connection.recv()
+            if message[0] == "stop":
+                break
+            try:
+                if message[0] == "turn":
+                    calls, pending, xs, ys = message[1:]
+                    grid = []
+                    results = {}
+                    for index in sorted(set(calls) | set(pending)):
+                        def look(index=index):
+                            if not grid:
+                                grid.append(NeighbourGrid(xs, ys))
+                            return lookup(grid[0], obstacle_grid, index, radius)
+                        capture.player = index
+                        call = budget.call(index) if index in calls else None
+                        result = _decide(players[index], streams[index], pending.get(index, ()), call,
+                                         xs[index], ys[index], look)
+                        if result is not None:
+                            results[index] = result + (call.elapsed, call.exceeded)
+                    printed = {index: "".join(texts) for index, texts in capture.texts.items()}
+                    capture.texts = {}
+                    connection.send(("turn", results, printed))
+                elif message[0] == "state":
+                    for index, calls in message[1].items():
+                        capture.player = index
+                        _decide(players[index], streams[index], calls, None, 0, 0, None)
+                    printed = {index: "".join(texts) for index, texts in capture.texts.items()}
+                    capture.texts = {}
+                    connection.send(("state", {index: (dump_player(player, index, teams[index]),
+                                                       pickle.dumps(streams[index], pickle.HIGHEST_PROTOCOL))
+                                               for index, player in players.items()}, printed))
+            except SnapshotError as e:
+                connection.send(("snapshot error", str(e)))
+            except Exception:
+                connection.send(("error", traceback.format_exc()))
+    connection.close()
+
+
+class DecisionPool():
+    """Decides the moves of all players of a turn in parallel.
+
+    Each of `workers` threads or processes decides the moves of every
+    workers-th player, the engine waits for all of them and then goes on
+    with the collision phase as usual. Processes are started once per game
+    and keep their players, so they are only sent the start of turn
+    positions each turn. The engine's players become stand-ins that pass
+    encounter_obstacle and collect_item on before the player's next
+    decision. Every player draws from random streams of its own (streams,
+    one Stream per player), so the functions of the random and numpy.random
+    modules give the same numbers whatever the number of workers; games
+    differ from serial games, in which the players share these modules. See
+    above for what the streams do not cover. Only worker processes can
+    interrupt a player that runs out of time, threads are checked
+    afterwards.
+    """
+
+    def __init__(self, mode, workers, players, streams, budget, config, obstacles, radius):
+        self.mode = mode
+        self.budget = budget
+        self.radius = radius
+        self.obstacle_grid = StaticGrid(obstacles)
+        self.num_players = len(players)
+        workers = min(workers if workers > 0 else os.cpu_count(), self.num_players)
+        self.chunks = [list(range(w, self.num_players, workers)) for w in range(workers)]
+        self.deferred = [_Deferred() for _ in players]
+        self.closed = False
+        self._state = None
+        self._error = None
+        # the error of a player that failed in a worker process; the pool
+        # cannot go on without the rest of that worker's turn
+        self._failure = None
+
+        if mode == THREADS:
+            _use_streams()
+            self.players = list(players)
+            self.streams = list(streams)
+            self.executor = ThreadPoolExecutor(workers)
+        else:
+            self.connections = []
+            self.processes = []
+            for chunk in self.chunks:
+                receiver, sender = multiprocessing.Pipe()
+                process = multiprocessing.Process(
+                    target=_worker, daemon=True,
+                    args=(sender, {index: players[index] for index in chunk}, {index: streams[index] for index in chunk},
+                          config.players, obstacles, radius, (self.num_players, config.turn_budget, config.game_budget,
+                                              config.budget_clock, config.preempt, list(budget.used))))
+                process.start()
+                sender.close()
+                self.connections.append(receiver)
+                self.processes.append(process)
+
+    def _pending(self, chunk):
+        pending = {}
+        for index in chunk:
+            if self.deferred[index].pending:
+                pending[index] = self.deferred[index].pending
+                self.deferred[index].pending = []
+        return pending
+
+    def decide(self, calls, xs, ys, output):
+        # the decisions of the players with indices in calls, from positions
+        # xs, ys, as {index: (action, new_x, new_y, seconds, lookup seconds,
+        # over budget)}; what the players print goes to output
+        calls = set(calls)
+        if self.mode == THREADS:
+            grid = NeighbourGrid(xs, ys)
+
+            def play(chunk, pending):
+                results = {}
+                for index in chunk:
+                    if index not in calls and index not in pending:
+                        continue
+                    output.player = index
+                    call = self.budget.call(index, preempt=False) if index in calls else None
+                    result = _decide(self.players[index], self.streams[index], pending.get(index, ()), call,
+                                     xs[index], ys[index], lambda: lookup(grid, self.obstacle_grid, index, self.radius))
+                    if result is not None:
+                        results[index] = result + (call.exceeded,)
+                return results
+
+            futures = [self.executor.submit(play, chunk, self._pending(chunk)) for chunk in self.chunks]
+            results = {}
+            for future in futures:
+                results.update(future.result())
+            return results
+
+        if self._failure is not None:
+            raise self._failure
+        for connection, chunk in zip(self.connections, self.chunks):
+            connection.send(("turn", [index for index in chunk if index in calls], self._pending(chunk), xs, ys))
+        results = {}
+        for turn in self._receive_all(output):
+            for index, (action, new_x, new_y, seconds, lookup_time, elapsed, exceeded) in turn.items():
+                self.budget.record(index, elapsed, exceeded)
+                results[index] = (action, new_x, new_y, seconds, lookup_time, exceeded)
+        return results
+
+    def _receive(self, connection, output):
+        kind, value, *printed = connection.recv()
+        if kind == "error":
+            raise RuntimeError("A player failed in a worker process:\n" + value)
+        if kind == "snapshot error":
+            raise SnapshotError(value)
+        for index, text in printed[0].items():
+            output.player = index
+            output.write(text)
+        return value, printed[0]
+
+    def _receive_all(self, output):
+        # the answers of every worker, so that none is left in a pipe to be
+        # read as the answer to the next message; the first error is raised
+        # once all answers are in
+        answers = []
+        error = None
+        for connection in self.connections:
+            try:
+                answers.append(self._receive(connection, output)[0])
+            except (RuntimeError, SnapshotError) as e:
+                error = error or e
+        if isinstance(error, RuntimeError):
+            self._failure = error
+        if error is not None:
+            raise error
+        return answers
+
+    def state(self, output):
+        # the players, up to date with everything the engine told them, and
+        # their random streams
+        if self._failure is not None:
+            raise self._failure
+        if self._error is not None:
+            raise self._error
+        if self._state is not None:
+            return self._state
+        if self.mode == THREADS:
+            for index in range(self.num_players):
+                output.player = index
+                _decide(self.players[index], self.streams[index], self._pending([index]).get(index, ()), None, 0, 0, None)
+            return list(self.players), list(self.streams)
+
+        players, streams = [None] * self.num_players, [None] * self.num_players
+        for connection, chunk in zip(self.connections, self.chunks):
+            connection.send(("state", self._pending(chunk)))
+        for blobs in self._receive_all(output):
+            for index, (player, stream) in blobs.items():
+                players[index], streams[index] = pickle.loads(player), pickle.loads(stream)
+        return players, streams
+
+    def close(self, output):
+        # stops the workers, keeping the final state of the players
+        if self.closed:
+            return
+        try:
+            if self._failure is None:
+                self._state = self.state(output)
+        except SnapshotError as e:
+            # the game still ends, only snapshots of it fail
+            self._error = e
+        self.closed = True
+        if self.mode == THREADS:
+            self.executor.shutdown()
+            _release_streams()
+        else:
+            for connection in self.connections:
+                connection.send(("stop",))
+                connection.close()
+            for process in self.processes:
+                process.join()
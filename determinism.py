@@ -0,0 +1,87 @@
+import argparse
+import multiprocessing
+
+# maps whose reference tour is checked: (seed, stalls, stalls to visit)
+TOUR_GAMES = [(2, 200, 100), (5, 200, 100), (2, 100, 50), (3, 40, 10), (7, 1000, 500)]
+# numbers of worker processes a game of each team is played with
+WORKERS = [1, 2, 3]
+# teams whose moves depend on the clock, so no two games are the same
+CLOCK_TEAMS = ["1"]
+
+
+def reference_tour(game):
+    # T and the reference tour of a map, built in a fresh process
+    from simulation import GameConfig, Simulation
+
+    seed, stalls, visit = game
+    sim = Simulation(GameConfig(no_of_stalls=stalls, no_to_visit=visit, players=["d"], seed=seed,
+                                log_level="off"))
+    return sim.T, [int(i) for i in sim.tsp_path]
+
+
+def check_tours(games=TOUR_GAMES, runs=3, workers=2):
+    # every map has to get the same T and tour in every run, even with
+    # several runs at the same time; returns the games that did not
+    failed = []
+    with multiprocessing.Pool(workers, maxtasksperchild=1) as pool:
+        results = pool.map(reference_tour, [game for game in games for _ in range(runs)])
+    for number, game in enumerate(games):
+        tours = results[number * runs:(number + 1) * runs]
+        same = all(tour == tours[0] for tour in tours)
+        print(("same " if same else "DIFFERENT ") + "tour for seed %d, %d stalls, %d to visit: T %s" %
+              (game + (", ".join(sorted(set(str(T) for T, tour in tours))),)), flush=True)
+        if not same:
+            failed.append(game)
+    return failed
+
+
+def parallel_game(team, workers, turns=150):
+    # a game of four players of a team and two default players, with the moves
+    # decided in worker processes: the ranking and the positions of the players
+    from simulation import GameConfig, Simulation
+
+    sim = Simulation(GameConfig(no_of_stalls=60, no_to_visit=8, players=[team] * 4 + ["d"] * 2, seed=7,
+                                log_level="off", player_output="discard", decisions="processes",
+                                decision_workers=workers))
+    try:
+        results = sim.run(max_turns=turns)
+        return results, sim.store.pos_x.tolist(), sim.store.pos_y.tolist()
+    finally:
+        sim.close()
+
+
+def check_workers(teams=None, workers=WORKERS):
+    # every team that comes with the simulator has to play the same game with
+    # any number of workers; returns the teams that did not
+    import player_registry
+
+    failed = []
+    for team in teams if teams is not None else player_registry.teams():
+        if team in CLOCK_TEAMS:
+            print("skipped team %s: its moves depend on the clock" % team, flush=True)
+            continue
+        try:
+            player_registry.player_class(team)
+        except ImportError as e:
+            print("skipped team %s: %s" % (team, e), flush=True)
+            continue
+        games = [parallel_game(team, number) for number in workers]
+        same = all(game == games[0] for game in games)
+        print(("same " if same else "DIFFERENT ") + "game for team %s with %s workers" %
+              (team, ", ".join(str(number) for number in workers)), flush=True)
+        if not same:
+            failed.append(team)
+    return failed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", default=3, help="Times every game is set up or played")
+    parser.add_argument("--workers", "-w", default=2, help="Games set up or played at the same time")
+    parser.add_argument("--teams", nargs="*", help="Teams whose games with 1, 2 and 3 workers are compared, all by default")
+    args = parser.parse_args()
+
+    failed = check_tours(runs=int(args.runs), workers=int(args.workers))
+    failed += check_workers(args.teams)
+    print(str(len(failed)) + " checks failed")
+    raise SystemExit(1 if failed else 0)
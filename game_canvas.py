@@ -0,0 +1,170 @@
+import tkinter as tk
+from tkinter import *
+import time
+import Pmw
+
+import constants
+
+
+class GameCanvas():
+    """Tkinter board shared by the live game and the replay viewer.
+
+    Subclasses provide stalls_to_visit, obstacles, player_states, turn_no, T,
+    scores, game_state and canvas_scale, the pause/resume/single_step button
+    commands, and _advance(), which moves the game forward during one frame.
+    """
+
+    def _init_canvas(self, fps=30):
+        self.frame_interval = max(1, int(1000 / fps))
+        self.root = tk.Tk()
+
+        self.canvas_height = 100 * self.canvas_scale
+        self.canvas_width = 100 * self.canvas_scale
+
+        # tkinter canvas components (used for updating text and color)
+        self.player_comp = []
+        self.score_comp = []
+        self.circles = []
+        self.title_comp = None
+        self.header_comp = None
+        self.turn_comp = None
+
+        # last state drawn for each player, so unchanged items are not redrawn
+        self._drawn_positions = [None] * len(self.player_states)
+        self._drawn_scores = [None] * len(self.player_states)
+        self._after_id = None
+
+    def _render_frame(self):
+        self.canvas = tk.Canvas(self.root, height=self.canvas_height + 2 * self.canvas_scale,
+                                width=self.canvas_width + 80 * self.canvas_scale, bg="#ADD8E6")
+        self.canvas.create_rectangle(self.canvas_scale, self.canvas_scale, self.canvas_height + 1 * self.canvas_scale,
+                                     self.canvas_width + 1 * self.canvas_scale, outline="#000000", fill="white", width=1)
+
+        # render stalls
+        for stall in self.stalls_to_visit:
+            x = stall.x + 1
+            y = stall.y + 1
+            self.canvas.create_rectangle((x - constants.stall_size / 2) * self.canvas_scale, (y - constants.stall_size / 2) * self.canvas_scale, (x +
+                                         constants.stall_size / 2) * self.canvas_scale, (y + constants.stall_size / 2) * self.canvas_scale, outline="#0e9cef", fill="#0e9cef", width=1)
+            self.canvas.create_text((x) * self.canvas_scale, (y) *
+                                    self.canvas_scale, font=('freemono', 11, 'bold'), text=stall.id)
+
+        for stall in self.obstacles:
+            x = stall.x + 1
+            y = stall.y + 1
+            self.canvas.create_rectangle((x - constants.stall_size / 2) * self.canvas_scale, (y - constants.stall_size / 2) * self.canvas_scale, (x +
+                                         constants.stall_size / 2) * self.canvas_scale, (y + constants.stall_size / 2) * self.canvas_scale, outline="#ff9695", fill="#ff9695", width=1)
+            self.canvas.create_text((x) * self.canvas_scale, (y) *
+                                    self.canvas_scale, font=('freemono', 11, 'bold'), text=stall.id)
+
+        for index, player_state in enumerate(self.player_states):
+            x = player_state.pos_x + 1
+            y = player_state.pos_y + 1
+            color = player_state.color
+            p = self.canvas.create_oval((x - 0.5) * self.canvas_scale, (y - 0.5) * self.canvas_scale,
+                                        (x + 0.5) * self.canvas_scale, (y + 0.5) * self.canvas_scale, fill=color)
+            balloon = Pmw.Balloon()
+            balloon.tagbind(self.canvas, p, 'Player ' + str(index + 1))
+            self.player_comp.append(p)
+
+        self.turn_comp = self.canvas.create_text((131) * self.canvas_scale, (14) * self.canvas_scale, anchor="nw", font=(
+            'freemono', int(1.8 * self.canvas_scale), 'bold'), text="TURN: " + str(self.turn_no) + "/" + str(self.T))
+
+        self.title_comp = self.canvas.create_text((133) * self.canvas_scale, (19) * self.canvas_scale, anchor="nw", font=(
+            'freemono', int(1.8 * self.canvas_scale), 'bold'), text="SCORES")
+
+        self.header_comp = self.canvas.create_text((110) * self.canvas_scale, (24) * self.canvas_scale, anchor="nw", font=(
+            'freemono', int(1.5 * self.canvas_scale), 'bold'), text=self._score_header())
+
+        for index, player_state in enumerate(self.player_states):
+            s = self.canvas.create_text((110) * self.canvas_scale, (5 * index + 29) * self.canvas_scale, font=('freemono', int(
+                1.5 * self.canvas_scale), 'bold'), anchor="nw", text=self._score_line(index, player_state))
+            c = self.canvas.create_oval((107 - 0.8) * self.canvas_scale, (5 * index + 31 - 0.8) * self.canvas_scale, (107 + 0.2) * self.canvas_scale,
+                                        (5 * index + 31 + 0.2) * self.canvas_scale, fill=player_state.color)
+            self.score_comp.append(s)
+            self.circles.append(c)
+
+        pause_btn = Button(self.canvas, width=int(0.4 * self.canvas_scale), height=int(0.3 * self.canvas_scale),
+                           bd='10', command=self.pause, font=('freemono', int(1.3 * self.canvas_scale), 'bold'), text="PAUSE")
+        pause_btn.place(x=125 * self.canvas_scale, y=0.3 * self.canvas_scale)
+
+        resume_btn = Button(self.canvas, width=int(0.4 * self.canvas_scale), height=int(0.3 * self.canvas_scale),
+                            bd='10', command=self.resume, font=('freemono', int(1.3 * self.canvas_scale), 'bold'), text="START/\nRESUME")
+        resume_btn.place(x=135 * self.canvas_scale, y=0.3 * self.canvas_scale)
+
+        step_btn = Button(self.canvas, width=int(0.4 * self.canvas_scale), height=int(0.3 * self.canvas_scale),
+                          bd='10', command=self.single_step, font=('freemono', int(1.3 * self.canvas_scale), 'bold'), text="STEP")
+        step_btn.place(x=145 * self.canvas_scale, y=0.3 * self.canvas_scale)
+
+        self.canvas.pack()
+
+    def _score_header(self):
+        s1 = "ID"
+        s2 = "Team"
+        s3 = "Interaction"
+        s4 = "Satisfaction"
+        s5 = "Items"
+        return s1.ljust(int(0.4 * self.canvas_scale), " ") + s2.ljust(int(1 * self.canvas_scale), " ") + s5.ljust(int(1.2 * self.canvas_scale), " ") + \
+            s3.ljust(int(1.5 * self.canvas_scale), " ") + s4.ljust(int(1.5 * self.canvas_scale), " ") + "\n"
+
+    def _score_line(self, index, player_state):
+        return str(index + 1).ljust(int(0.4 * self.canvas_scale), " ") + str(player_state.name).ljust(int(1 * self.canvas_scale), " ") + (str(player_state.items_obtained) + "/" + str(
+            len(self.stalls_to_visit))).ljust(int(1.2 * self.canvas_scale), " ") + str(player_state.interaction).ljust(int(1.5 * self.canvas_scale), " ") + str(round(player_state.satisfaction, 2)).ljust(int(1.5 * self.canvas_scale), " ")
+
+    def _schedule(self):
+        # only one render loop may be pending at a time
+        if self._after_id is None:
+            self._after_id = self.root.after(self.frame_interval, self._play_game)
+
+    def _play_game(self):
+        # render loop: move the game forward for at most one frame, then draw
+        # the latest state once
+        self._after_id = None
+        self._advance(time.perf_counter(), self.frame_interval / 1000)
+
+        self._draw_state()
+        if self.game_state == "resume":
+            self._schedule()
+
+    def _draw_state(self):
+        over = self.game_state == "over"
+
+        # update player positions on game board, skipping players that did not move
+        for index, player_state in enumerate(self.player_states):
+            pos = (player_state.pos_x, player_state.pos_y)
+            if self._drawn_positions[index] != pos:
+                self._drawn_positions[index] = pos
+                self.canvas.moveto(self.player_comp[index], (player_state.pos_x + 0.5)
+                                   * self.canvas_scale, (player_state.pos_y + 0.5) * self.canvas_scale)
+
+            if over:
+                continue
+            score = (player_state.items_obtained, player_state.interaction, player_state.satisfaction)
+            if self._drawn_scores[index] != score:
+                self._drawn_scores[index] = score
+                self.canvas.itemconfigure(self.score_comp[index], text=self._score_line(index, player_state))
+
+        if over:
+            self._draw_results()
+            return
+
+        self.canvas.itemconfigure(
+            self.turn_comp, text="TURN: " + str(self.turn_no) + "/" + str(self.T))
+
+    def _draw_results(self):
+        scores = self.scores
+
+        s1 = "ID"
+        s2 = "Team"
+        s4 = "Satisfaction"
+        s5 = "Items"
+
+        self.canvas.itemconfigure(self.title_comp, text="RESULTS")
+        self.canvas.itemconfigure(self.header_comp, text=s1.ljust(int(0.4 * self.canvas_scale), " ") + s2.ljust(int(
+            1 * self.canvas_scale), " ") + s5.ljust(int(1.2 * self.canvas_scale), " ") + s4.ljust(int(1.5 * self.canvas_scale), " "))
+
+        for index, score in enumerate(scores):
+            self.canvas.itemconfigure(self.score_comp[index], text=str(score[0]).ljust(4, " ") + str(score[1]).ljust(10, " ") + (str(score[2]) + "/" + str(
+                len(self.stalls_to_visit))).ljust(int(1 * self.canvas_scale), " ") + str(round(score[3], 2)).ljust(int(1.5 * self.canvas_scale), " "))
+            self.canvas.itemconfigure(
+                self.circles[index], fill=self.player_states[score[0] - 1].color)
@@ -0,0 +1,67 @@
+import os
+
+# log levels, each one includes the ones before it
+OFF = 0
+RESULTS = 1  # game configuration, stalls, tsp path and the final results
+SUMMARY = 2  # plus the per turn score table
+TRACE = 3    # plus every player's action and events, every turn
+
+LEVELS = {"off": OFF, "results": RESULTS, "summary": SUMMARY, "trace": TRACE}
+
+
+class GameLogger():
+    """Text logs of one game.
+
+    Every log file is opened once, kept open for the whole game and written
+    through a buffer; the buffers are flushed every flush_every turns (0 means
+    only when the logger is closed). Writes to a file whose level is above the
+    logger's level are dropped, and callers can check enabled() to skip
+    formatting altogether.
+    """
+
+    def __init__(self, log_dir, level=TRACE, flush_every=0, buffer_size=1 << 16):
+        if isinstance(level, str):
+            level = LEVELS[level.lower()]
+        if log_dir is None:
+            level = OFF
+
+        self.log_dir = log_dir
+        self.level = level
+        self.flush_every = flush_every
+        self.buffer_size = buffer_size
+        self.files = {}
+
+        if self.level > OFF:
+            os.makedirs(log_dir, exist_ok=True)
+
+    def enabled(self, level):
+        return self.level >= level
+
+    def open(self, name, level, header=""):
+        if not self.enabled(level):
+            return
+        f = open(os.path.join(self.log_dir, name), 'w', buffering=self.buffer_size)
+        f.write(header)
+        self.files[name] = f
+
+    def file(self, name):
+        # the open file, or None when it is not being logged
+        return self.files.get(name)
+
+    def write(self, name, text):
+        f = self.files.get(name)
+        if f is not None:
+            f.write(text)
+
+    def end_turn(self, turn_no):
+        if self.flush_every > 0 and turn_no % self.flush_every == 0:
+            self.flush()
+
+    def flush(self):
+        for f in self.files.values():
+            f.flush()
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+        self.files = {}
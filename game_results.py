@@ -0,0 +1,82 @@
+import csv
+import json
+import os
+
+# columns of the CSV format: one row per player, with the game's configuration
+# and timing repeated on every row so the file loads as a single table
+CSV_FIELDS = ["index", "seed", "layout", "no_of_stalls", "no_to_visit", "no_of_obstacles", "players", "theta", "T",
+              "turns", "time", "turns_per_second", "id", "team", "rank", "items", "satisfaction",
+              "decision_time", "timeouts", "skipped_turns", "printed_bytes", "chatty", "error"]
+
+
+def game_record(sim):
+    # one structured record of a game: configuration, ranking and timing
+    config = sim.config
+    chatty = sim.player_output.chatty()
+    players = []
+    for rank, (id, team, items, satisfaction) in enumerate(sim.results(), 1):
+        players.append({"id": id, "team": team, "rank": rank, "items": items, "satisfaction": satisfaction,
+                        "decision_time": sim.decision_time[id - 1], "timeouts": sim.budget.violations[id - 1],
+                        "skipped_turns": sim.budget.skipped[id - 1],
+                        "printed_bytes": sim.player_output.bytes[id - 1], "chatty": id - 1 in chatty})
+
+    return {
+        "config": {
+            "seed": config.seed,
+            "layout": config.layout,
+            "no_of_stalls": sim.no_of_stalls,
+            "no_to_visit": sim.no_to_visit,
+            "no_of_obstacles": sim.no_of_stalls - sim.no_to_visit,
+            "players": list(config.players),
+            "theta": sim.theta,
+            "T": sim.T,
+        },
+        "players": players,
+        "turns": sim.iteration,
+        "finished": sim.is_over(),
+        "time": sim.elapsed,
+        "turns_per_second": sim.iteration / sim.elapsed if sim.elapsed > 0 else 0.0,
+    }
+
+
+def error_record(config, error):
+    # record of a game that could not be played
+    return {"config": config, "players": [], "error": error}
+
+
+def results_format(path):
+    # the format implied by a file name: "csv" or "jsonl"
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def append_record(path, record, format=None):
+    if format is None:
+        format = results_format(path)
+
+    if format == "jsonl":
+        with open(path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+        return
+
+    new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        if new_file:
+            writer.writeheader()
+        writer.writerows(csv_rows(record))
+
+
+def csv_rows(record):
+    config = record["config"]
+    game = {"index": record.get("index"), "seed": config.get("seed"), "layout": config.get("layout"),
+            "no_of_stalls": config.get("no_of_stalls"), "no_to_visit": config.get("no_to_visit"),
+            "players": " ".join(config.get("players", [])),
+            "theta": config.get("theta"), "T": config.get("T"), "turns": record.get("turns"),
+            "time": record.get("time"), "turns_per_second": record.get("turns_per_second"),
+            "error": record.get("error")}
+    if config.get("no_of_stalls") is not None and config.get("no_to_visit") is not None:
+        game["no_of_obstacles"] = config["no_of_stalls"] - config["no_to_visit"]
+
+    if not record["players"]:
+        return [game]
+    return [dict(game, **player) for player in record["players"]]
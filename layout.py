@@ -0,0 +1,149 @@
+import math
+import random
+
+GRID = "grid"
+LEGACY = "legacy"
+LAYOUTS = [GRID, LEGACY]
+
+# stalls are 2 x 2 squares that may not overlap or touch, with their centres
+# in [2, 98] x [2, 98] so that they lie inside [1, 99] x [1, 99]; two stalls
+# overlap when their centres are at most SPACING apart on both axes
+LOW = 2
+HIGH = 98
+SPACING = 2
+
+# at most LATTICE x LATTICE stalls fit: HIGH - LOW = 96 holds 48 gaps of
+# exactly SPACING, but not of more than SPACING
+LATTICE = 48
+MAX_STALLS = LATTICE * LATTICE
+
+# random placement fills the map up to about 1350 stalls and slows down long
+# before that; denser maps are placed on a jittered lattice
+DART_LIMIT = 900
+DART_ATTEMPTS = 50
+
+# candidates the legacy layout draws for one stall before it gives up
+LEGACY_ATTEMPTS = 100000
+
+# cells of side CELL over [0, 102] x [0, 102], which also covers the first
+# legacy stall (see _legacy_overlap)
+CELL = 2
+CELLS = 51
+
+
+class LayoutError(ValueError):
+    pass
+
+
+class _Occupancy():
+    # the placed stalls by cell; a cell of side SPACING holds at most one
+    # stall and every stall that can overlap a candidate is in one of the
+    # `reach` cells around the candidate's cell
+    def __init__(self, reach):
+        self.cells = [[] for _ in range(CELLS * CELLS)]
+        self.reach = reach
+
+    def nearby(self, x, y):
+        i, j = int(x // CELL), int(y // CELL)
+        for a in range(max(0, i - self.reach), min(CELLS, i + self.reach + 1)):
+            for b in range(max(0, j - self.reach), min(CELLS, j + self.reach + 1)):
+                yield from self.cells[a * CELLS + b]
+
+    def add(self, x, y):
+        self.cells[int(x // CELL) * CELLS + int(y // CELL)].append((x, y))
+
+
+def check_feasible(no_of_stalls):
+    if no_of_stalls > MAX_STALLS:
+        raise LayoutError("At most " + str(MAX_STALLS) + " stalls fit on the map without overlapping")
+
+
+def place_stalls(no_of_stalls, layout=GRID):
+    # centres of no_of_stalls stalls that do not overlap, drawn from the
+    # random module so that the seed of the game decides them
+    check_feasible(no_of_stalls)
+    if layout == LEGACY:
+        return _legacy(no_of_stalls)
+    if no_of_stalls <= DART_LIMIT:
+        stalls = _darts(no_of_stalls)
+        if stalls is not None:
+            return stalls
+    return _lattice(no_of_stalls)
+
+
+def _darts(no_of_stalls):
+    # uniformly random candidates, each checked against the stalls in the
+    # cells around it; None if the map fills up before all stalls are placed
+    occupancy = _Occupancy(1)
+    stalls = []
+    attempts = DART_ATTEMPTS * no_of_stalls
+    while len(stalls) < no_of_stalls:
+        if attempts == 0:
+            return None
+        attempts -= 1
+        x = random.uniform(LOW, HIGH)
+        y = random.uniform(LOW, HIGH)
+        if all(abs(x - sx) > SPACING or abs(y - sy) > SPACING for sx, sy in occupancy.nearby(x, y)):
+            occupancy.add(x, y)
+            stalls.append((x, y))
+    return stalls
+
+
+def _lattice(no_of_stalls):
+    # one stall in each of no_of_stalls random cells of a k x k lattice over
+    # [1, 99] x [1, 99], at a random place inside its cell; stalls in
+    # different cells cannot touch, however dense the map
+    k = min(LATTICE, math.ceil(math.sqrt(2 * no_of_stalls)))
+    side = (HIGH - LOW + 2) / k
+    # a little margin keeps stalls in neighbouring cells from touching
+    play = side - SPACING - 0.002
+    stalls = []
+    for cell in random.sample(range(k * k), no_of_stalls):
+        x = LOW - 1 + (cell // k) * side + 1.001 + random.uniform(0, play)
+        y = LOW - 1 + (cell % k) * side + 1.001 + random.uniform(0, play)
+        stalls.append((x, y))
+    return stalls
+
+
+def _legacy(no_of_stalls):
+    # the original rejection sampling: draw the top left corner of a stall
+    # until it overlaps no placed stall, with the original overlap test, so a
+    # seed gives the same map as before; the occupancy grid only saves
+    # testing stalls that are too far away to overlap. As before, the bounds
+    # are only checked once there is a stall, so the first stall can lie
+    # anywhere in [1, 101] x [1, 101]
+    occupancy = _Occupancy(2)
+    stalls = []
+    for count in range(no_of_stalls):
+        x = random.uniform(0, 100)
+        y = random.uniform(0, 100)
+        attempts = 0
+        while count > 0 and _legacy_overlap(x, y, occupancy):
+            attempts += 1
+            if attempts == LEGACY_ATTEMPTS:
+                raise LayoutError("The legacy layout could not place stall " + str(count + 1) + " of " +
+                                  str(no_of_stalls) + ", the map is too full; use the grid layout")
+            x = random.uniform(0, 100)
+            y = random.uniform(0, 100)
+        occupancy.add(x + 1, y + 1)
+        stalls.append((x + 1, y + 1))
+    return stalls
+
+
+def _legacy_overlap(x, y, occupancy):
+    if x > 97 or y > 97 or x < 1 or y < 1:
+        return True
+    c1_x, c1_y = x, y
+    c2_x, c2_y = x + 2, y
+    c3_x, c3_y = x + 2, y + 2
+    c4_x, c4_y = x, y + 2
+    for stall_x, stall_y in occupancy.nearby(x + 1, y + 1):
+        stall_c1_x, stall_c1_y = stall_x - 1, stall_y - 1
+        stall_c2_x, stall_c2_y = stall_x + 1, stall_y + 1
+
+        if (c1_x >= stall_c1_x and c1_x <= stall_c2_x and c1_y >= stall_c1_y and c1_y <= stall_c2_y) or \
+            (c2_x >= stall_c1_x and c2_x <= stall_c2_x and c2_y >= stall_c1_y and c2_y <= stall_c2_y) or \
+            (c3_x >= stall_c1_x and c3_x <= stall_c2_x and c3_y >= stall_c1_y and c3_y <= stall_c2_y) or \
+                (c4_x >= stall_c1_x and c4_x <= stall_c2_x and c4_y >= stall_c1_y and c4_y <= stall_c2_y):
+            return True
+    return False
@@ -1,5 +1,15 @@
 import argparse
-from dodgem_game import DodgemGame
+import os
+import pickle
+import tempfile
+import time
+
+import constants
+from game_results import append_record, game_record
+from layout import LayoutError
+from player_state import SnapshotError
+from simulation import GameConfig, Simulation
+from world import load_world
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
@@ -9,9 +19,150 @@ if __name__ == '__main__':
     parser.add_argument("--total_time", "-T", default=-1, help="Total time threshold")
     parser.add_argument("--players", "-p", default=['1', '2', '3', '4', '5', '6'], nargs="+", help="List of players space separated")
     parser.add_argument("--seed", "-s", default=2, help="Seed")
+    parser.add_argument("--layout", default="grid", choices=["grid", "legacy"],
+                        help="How stalls are placed: grid, or legacy for the maps of earlier versions")
+    parser.add_argument("--world", default=None,
+                        help="Play on the map of this world file (see world.py) instead of generating one")
     parser.add_argument("--gui", "-g", default="True", help="GUI")
     parser.add_argument("--scale", "-sc", default=10, help="Scale factor")
-    parser.add_argument("--interval", "-i", default=100, help="Time in ms after which the next iteration is executed")
+    parser.add_argument("--interval", "-i", default=100, help="Time in ms after which the next iteration is executed, 0 runs the game at full speed")
+    parser.add_argument("--fps", default=30, help="Frames per second drawn by the GUI")
     parser.add_argument("--disable_tsp", "-d", default="False", help="Disable or enable the tsp algorithm in simulator")
+    parser.add_argument("--log_level", "-l", default="trace", choices=["off", "results", "summary", "trace"],
+                        help="Logs to write: nothing, results only, plus per turn scores, plus every player's moves")
+    parser.add_argument("--log_flush", default=0, help="Flush the logs every N turns (0 flushes at the end of the game)")
+    parser.add_argument("--player_output", default="discard", choices=["discard", "buffer"],
+                        help="Discard what the players print, or keep their last lines in player_output.txt")
+    parser.add_argument("--replay", default=None, help="Record the game to this replay file")
+    parser.add_argument("--output_dir", "-o", default=None,
+                        help="Directory for the logs and checkpoints of this run (default: a new directory in logs/)")
+    parser.add_argument("--checkpoint", default=0, help="Save a snapshot of the game to checkpoint.bin every N turns (0 never saves)")
+    parser.add_argument("--restore", default=None, help="Continue the game saved in this snapshot file")
+    parser.add_argument("--turn_budget", default=constants.turn_timeout,
+                        help="Seconds a player may spend on one turn before it is made to stay in place (0 is unlimited)")
+    parser.add_argument("--game_budget", default=constants.timeout,
+                        help="Seconds a player may spend on the whole game, after which it stays in place (0 is unlimited)")
+    parser.add_argument("--budget_clock", default="wall", choices=["wall", "cpu"], help="Clock the time budgets are measured on")
+    parser.add_argument("--decisions", default="serial", choices=["serial", "threads", "processes"],
+                        help="Let the players decide their moves one after the other, or at the same time in worker threads or processes")
+    parser.add_argument("--decision_workers", default=0, help="Number of decision worker threads or processes (0 is one per core)")
+    parser.add_argument("--profile", nargs="?", const="phases", default=None, choices=["phases", "cprofile", "stacks"],
+                        help="Time every phase of every turn; cprofile also saves a cProfile of the run, stacks sampled collapsed stacks")
+    parser.add_argument("--results", "-r", default=None,
+                        help="Append a record of the game to this file, as CSV if the name ends in .csv, else JSON Lines")
     args = parser.parse_args()
-    dodgem_game = DodgemGame(args)
\ No newline at end of file
+
+    if args.gui not in ("True", "true", "False", "false"):
+        print("ERROR: Enter a valid gui argument (True/False)")
+        raise SystemExit(1)
+
+    snapshot = None
+    if args.restore is not None:
+        try:
+            with open(args.restore, "rb") as f:
+                snapshot = f.read()
+        except OSError as e:
+            print("ERROR: Cannot read snapshot: " + str(e))
+            raise SystemExit(1)
+
+    config = GameConfig.from_args(args, log_level=args.log_level, log_flush_every=int(args.log_flush),
+                                  player_output=args.player_output, replay=args.replay,
+                                  checkpoint_every=int(args.checkpoint), turn_budget=float(args.turn_budget),
+                                  game_budget=float(args.game_budget), budget_clock=args.budget_clock,
+                                  layout=args.layout)
+    config.profile = args.profile is not None
+    config.decisions = args.decisions
+    config.decision_workers = int(args.decision_workers)
+    if args.world is not None:
+        # the world decides the numbers of stalls
+        try:
+            world = load_world(args.world)
+        except (OSError, ValueError) as e:
+            print("ERROR: Cannot read world: " + str(e))
+            raise SystemExit(1)
+        config.world = args.world
+        config.no_of_stalls = len(world["stalls"])
+        config.no_to_visit = len(world["visit"])
+    try:
+        config.validate()
+    except ValueError as e:
+        print("ERROR: " + str(e))
+        raise SystemExit(1)
+
+    # every run writes to a directory of its own, so games never overwrite
+    # each other's files and nothing is ever deleted
+    try:
+        if args.output_dir is not None:
+            os.makedirs(args.output_dir, exist_ok=True)
+            config.log_dir = args.output_dir
+        else:
+            os.makedirs("logs", exist_ok=True)
+            config.log_dir = tempfile.mkdtemp(prefix=time.strftime("%Y%m%d-%H%M%S-"), dir="logs")
+    except OSError as e:
+        print("ERROR: Cannot create the output directory: " + str(e))
+        raise SystemExit(1)
+    if config.checkpoint_every > 0:
+        config.checkpoint = os.path.join(config.log_dir, "checkpoint.bin")
+    print("Output directory: " + config.log_dir)
+
+    if args.gui in ("True", "true"):
+        from dodgem_game import DodgemGame
+        game, options = DodgemGame, {"interval": int(args.interval), "fps": int(args.fps)}
+    else:
+        game, options = Simulation, {}
+
+    if snapshot is not None:
+        # the map and the players come from the snapshot, everything else from the command line
+        changes = {"log_dir": config.log_dir, "log_level": config.log_level, "log_flush_every": config.log_flush_every,
+                   "player_output": config.player_output, "replay": config.replay,
+                   "checkpoint": config.checkpoint, "checkpoint_every": config.checkpoint_every,
+                   "turn_budget": config.turn_budget, "game_budget": config.game_budget,
+                   "budget_clock": config.budget_clock, "profile": config.profile,
+                   "decisions": config.decisions, "decision_workers": config.decision_workers}
+        try:
+            sim = game.restore(snapshot, changes, **options)
+        except (EOFError, ValueError, pickle.UnpicklingError) as e:
+            print("ERROR: Cannot restore snapshot: " + str(e))
+            raise SystemExit(1)
+    else:
+        try:
+            sim = game(config, **options)
+        except LayoutError as e:
+            print("ERROR: " + str(e))
+            raise SystemExit(1)
+
+    # the profilers are only imported when they are used
+    if args.profile == "cprofile":
+        import cProfile
+        code_profile = cProfile.Profile()
+        code_profile.enable()
+    elif args.profile == "stacks":
+        from profiler import StackSampler
+        code_profile = StackSampler()
+        code_profile.start()
+
+    try:
+        if args.gui in ("True", "true"):
+            sim.play()
+        else:
+            sim.run(progress=True)
+    except SnapshotError as e:
+        # a checkpoint of a player that cannot be pickled
+        sim.close()
+        print("\nERROR: " + str(e))
+        raise SystemExit(1)
+
+    if args.profile is not None:
+        print("\n" + sim.profiler.report())
+    if args.profile == "cprofile":
+        code_profile.disable()
+        code_profile.dump_stats(os.path.join(config.log_dir, "cprofile.prof"))
+        import pstats
+        with open(os.path.join(config.log_dir, "cprofile.txt"), "w") as f:
+            pstats.Stats(code_profile, stream=f).sort_stats("cumulative").print_stats(50)
+    elif args.profile == "stacks":
+        code_profile.stop()
+        code_profile.write(os.path.join(config.log_dir, "stacks.txt"))
+
+    if args.results is not None:
+        append_record(args.results, game_record(sim))
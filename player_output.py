@@ -0,0 +1,72 @@
+import threading
+from collections import deque
+
+DISCARD = "discard"
+BUFFER = "buffer"
+
+# bytes a player may print in a game before its results flag it as chatty
+CHATTY_BYTES = 1 << 20
+
+
+class PlayerOutput():
+    """Sink for everything the players print during a game.
+
+    The engine points sys.stdout at a single PlayerOutput for the whole game
+    and sets `player` to the index of the player it is about to call, so the
+    output is attributed to the right player; `player` is kept per thread,
+    for players that decide their moves in worker threads. The number of
+    bytes printed by each player is always counted. In BUFFER mode the last
+    `max_lines` lines of every player are kept as well, otherwise the text
+    is discarded.
+    """
+
+    def __init__(self, num_players, mode=DISCARD, max_lines=100):
+        if mode not in (DISCARD, BUFFER):
+            raise ValueError("Player output mode has to be " + DISCARD + " or " + BUFFER)
+
+        self.mode = mode
+        self._current = threading.local()
+        self.bytes = [0] * num_players
+        self.buffers = None
+        self._partial = None
+        if mode == BUFFER:
+            self.buffers = [deque(maxlen=max_lines) for _ in range(num_players)]
+            self._partial = [""] * num_players
+
+    @property
+    def player(self):
+        return getattr(self._current, "player", 0)
+
+    @player.setter
+    def player(self, index):
+        self._current.player = index
+
+    def write(self, text):
+        player = self.player
+        self.bytes[player] += len(text) if text.isascii() else len(text.encode("utf-8", "replace"))
+
+        if self.buffers is not None:
+            lines = (self._partial[player] + text).split("\n")
+            self.buffers[player].extend(lines[:-1])
+            self._partial[player] = lines[-1]
+
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+    def lines(self, index):
+        # the buffered output of a player, oldest line first
+        if self.buffers is None:
+            return []
+        lines = list(self.buffers[index])
+        if self._partial[index]:
+            lines.append(self._partial[index])
+        return lines
+
+    def chatty(self, limit=CHATTY_BYTES):
+        # indices of the players that printed more than limit bytes
+        return [index for index, count in enumerate(self.bytes) if count > limit]
@@ -0,0 +1,111 @@
+import importlib
+import importlib.util
+import inspect
+import os
+import random
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# teams are the modules players/team_<name>.py, plus the players that
+# installed packages register under this entry point group, for example
+# [project.entry-points."dodgem.players"] 8 = "my_team.player:Player"
+PLAYERS_DIR = os.path.join(ROOT, "players")
+ENTRY_POINT_GROUP = "dodgem.players"
+
+# every name that is not a team plays players/default_player.py
+DEFAULT = "d"
+DEFAULT_MODULE = "players.default_player"
+
+COLORS = {
+    '1': 'yellow',
+    '2': 'white',
+    '3': 'black',
+    '4': 'violet',
+    '5': 'green',
+    '6': 'gray',
+    '7': 'orange',
+    DEFAULT: 'black'
+}
+
+_teams = None
+_entry_points = None
+_classes = {}
+_parameters = {}
+
+
+def _scan():
+    # team name -> module, from the players directory
+    global _teams
+    if _teams is None:
+        _teams = {}
+        for file in sorted(os.listdir(PLAYERS_DIR)):
+            if file.startswith("team_") and file.endswith(".py"):
+                _teams[file[len("team_"):-len(".py")]] = "players." + file[:-len(".py")]
+    return _teams
+
+
+def _installed():
+    # team name -> entry point, read only when a name is not in the players
+    # directory since reading the installed packages' metadata takes a while
+    global _entry_points
+    if _entry_points is None:
+        from importlib.metadata import entry_points
+        _entry_points = {entry.name: entry for entry in entry_points(group=ENTRY_POINT_GROUP)}
+    return _entry_points
+
+
+def teams():
+    # names of every team that can be selected
+    return sorted(set(_scan()) | set(_installed()))
+
+
+def is_team(name):
+    return name in _scan() or (name != DEFAULT and name in _installed())
+
+
+def player_module(name):
+    # name of the module a player plays, without importing it
+    if name in _scan():
+        return _scan()[name]
+    if name != DEFAULT and name in _installed():
+        return _installed()[name].module
+    return DEFAULT_MODULE
+
+
+def player_source(name):
+    # the file of a player's module, relative to the repository if it is in it
+    module = player_module(name)
+    if module.startswith("players."):
+        return os.path.join("players", module[len("players."):] + ".py")
+    return importlib.util.find_spec(module).origin
+
+
+def player_class(name):
+    # the class that plays a name; modules are imported the first time a game
+    # uses them, so a game without them never loads their dependencies
+    if name not in _classes:
+        # teams seed the random module when they are imported, which must not
+        # change the game that imports them
+        state = random.getstate()
+        if name in _scan() or not is_team(name):
+            cls = importlib.import_module(player_module(name)).Player
+        else:
+            cls = _installed()[name].load()
+        random.setstate(state)
+        _classes[name] = cls
+    return _classes[name]
+
+
+def accepts(name, parameter):
+    # whether the player of a name takes an optional constructor argument,
+    # such as tsp_service; players that do not are built as before
+    if name not in _parameters:
+        try:
+            _parameters[name] = set(inspect.signature(player_class(name)).parameters)
+        except (TypeError, ValueError):
+            _parameters[name] = set()
+    return parameter in _parameters[name]
+
+
+def player_color(name):
+    return COLORS.get(name, COLORS[DEFAULT])
@@ -1,10 +1,76 @@
 import math
-import time
-import random
-import os
+import pickle
+
+import numpy as np
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def dump_player(player, index, team):
+    # a player pickled for a snapshot; a player that holds something that
+    # cannot be pickled has to leave it out with __getstate__/__setstate__
+    try:
+        return pickle.dumps(player, pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        raise SnapshotError("Cannot save player %d (team %s) in a snapshot: %s" % (index + 1, team, e)) from None
+
+
+class PlayerStore:
+    """Columnar state of every player in a game.
+
+    Positions, wait times, interactions, items and satisfaction live in one
+    contiguous array each, indexed by player index, so the engine can work
+    on all players at once. The per turn scratch buffers are allocated once
+    and reset at the start of every turn.
+    """
+
+    def __init__(self, n):
+        self.n = n
+
+        self.pos_x = np.zeros(n, dtype=np.float64)
+        self.pos_y = np.zeros(n, dtype=np.float64)
+        self.wait = np.zeros(n, dtype=np.int64)
+        self.interaction = np.zeros(n, dtype=np.int64)
+        self.items = np.zeros(n, dtype=np.int64)
+        self.satisfaction = np.zeros(n, dtype=np.float64)
+
+        # per turn scratch buffers
+        self.new_x = np.zeros(n, dtype=np.float64)
+        self.new_y = np.zeros(n, dtype=np.float64)
+        self.update_move = np.zeros(n, dtype=bool)
+        self.update_wait = np.zeros(n, dtype=bool)
+        self.interrupt = np.zeros(n, dtype=bool)
+        # action code and event bits of the turn, see replay.py
+        self.action = np.zeros(n, dtype=np.uint8)
+        self.events = np.zeros(n, dtype=np.uint8)
+
+    def reset_turn(self):
+        self.new_x[:] = self.pos_x
+        self.new_y[:] = self.pos_y
+        self.update_move[:] = False
+        self.update_wait[:] = False
+        self.interrupt[:] = False
+        self.action[:] = 0
+        self.events[:] = 0
+
 
 class PlayerState:
-    def __init__(self, id, name, color, initial_pos_x, initial_pos_y, stalls_to_visit, T_theta, tsp_path):
+    """View of one player in a PlayerStore.
+
+    The numeric attributes read and write the store's arrays, so existing
+    code can keep using player_state.pos_x, .wait and so on. A standalone
+    PlayerState gets a store of its own.
+    """
+
+    def __init__(self, id, name, color, initial_pos_x, initial_pos_y, stalls_to_visit, T_theta, tsp_path,
+                 store=None, index=0):
+        if store is None:
+            store, index = PlayerStore(1), 0
+        self._store = store
+        self._index = index
+
         self.id = id
         self.name = name
         self.color = color
@@ -25,6 +91,7 @@ class PlayerState:
 
         # list of visited stalls
         self.visited_stalls = []
+        self.unvisited_stalls = set(stall.id for stall in stalls_to_visit)
 
         # items obtained
         self.items_obtained = 0
@@ -32,21 +99,65 @@ class PlayerState:
         self.interaction = 0
         self.satisfaction = 0
 
-        # log file
-        self.log = os.path.join("logs", "player " + str(id) + " team " + str(name) + ".txt")
-        
-        with open(self.log, 'w') as f:
-            f.write("Player Moves\n")
         self.score = 0
 
+    @property
+    def pos_x(self):
+        return float(self._store.pos_x[self._index])
+
+    @pos_x.setter
+    def pos_x(self, value):
+        self._store.pos_x[self._index] = value
+
+    @property
+    def pos_y(self):
+        return float(self._store.pos_y[self._index])
+
+    @pos_y.setter
+    def pos_y(self, value):
+        self._store.pos_y[self._index] = value
+
+    @property
+    def wait(self):
+        return int(self._store.wait[self._index])
+
+    @wait.setter
+    def wait(self, value):
+        self._store.wait[self._index] = value
+
+    @property
+    def interaction(self):
+        return int(self._store.interaction[self._index])
+
+    @interaction.setter
+    def interaction(self, value):
+        self._store.interaction[self._index] = value
+
+    @property
+    def items_obtained(self):
+        return int(self._store.items[self._index])
+
+    @items_obtained.setter
+    def items_obtained(self, value):
+        self._store.items[self._index] = value
+
+    @property
+    def satisfaction(self):
+        return float(self._store.satisfaction[self._index])
+
+    @satisfaction.setter
+    def satisfaction(self, value):
+        self._store.satisfaction[self._index] = value
+
     def start_wait(self):
         self.wait = 10
-        
+
     def update_position(self, pos_x, pos_y):
         self.pos_x, self.pos_y = pos_x, pos_y
 
     def add_stall_visited(self, stall_id):
         self.visited_stalls.append(stall_id)
+        self.unvisited_stalls.discard(stall_id)
 
     def add_items(self, item):
         self.items_obtained += item
@@ -58,4 +169,4 @@ class PlayerState:
         self.satisafaction = self.interaction * math.log(self.interaction, 2)
 
     def look_up(self, players, obstacles):
-        pass
\ No newline at end of file
+        pass
@@ -83,7 +83,7 @@ def grid_example():
 def grid_benchmark():
     '''try to find the shortest path in large grid-like graph
     '''
-    graph = generate_grid_graph(500, 100, 0.75)
+    graph = generate_graph()
     start, end = 0, graph.get_vertex_count() - 1
     start_time = time.time()
     path = graph.search(start, end)
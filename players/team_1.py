@@ -11,7 +11,8 @@ MAX_SECS = 0.5
 
 
 class Player:
-    def __init__(self, id, name, color, initial_pos_x, initial_pos_y, stalls_to_visit, T_theta, tsp_path, num_players):
+    def __init__(self, id, name, color, initial_pos_x, initial_pos_y, stalls_to_visit, T_theta, tsp_path, num_players,
+                 tsp_service=None):
         self.id = id
         self.name = name
         self.color = color
@@ -29,17 +30,8 @@ class Player:
         self.sign_y = 1
 
         # Added functionality
-        self.distance_grid = []
-        for i in range(len(stalls_to_visit) + 1):
-            row = []
-            for j in range(len(stalls_to_visit) + 1):
-                row.append(0)
-
-            # Add the row to the list
-            self.distance_grid.append(row)
-
         self.queue = deque()
-        self.set_tsp_path()
+        self.set_tsp_path(tsp_service)
         self.set_queue()
 
         self.obstacles_list = []
@@ -70,7 +62,21 @@ class Player:
         for i in self.tsp_path[1:]:
             self.queue.append(self.stalls_to_visit[i - 1])
 
-    def set_tsp_path(self):
+    def set_tsp_path(self, tsp_service=None):
+        if tsp_service is not None:
+            # the simulator's shared tour, from our position (node 0)
+            self.tsp_path = [0] + [i + 1 for i in tsp_service.tour((self.pos_x, self.pos_y))]
+            return
+
+        self.distance_grid = []
+        for i in range(len(self.stalls_to_visit) + 1):
+            row = []
+            for j in range(len(self.stalls_to_visit) + 1):
+                row.append(0)
+
+            # Add the row to the list
+            self.distance_grid.append(row)
+
         s_to_v = self.stalls_to_visit
 
         for i in range(len(s_to_v)):
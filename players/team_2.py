@@ -7,7 +7,8 @@ random.seed(2)
 
 
 class Player:
-    def __init__(self, id, name, color, initial_pos_x, initial_pos_y, stalls_to_visit, T_theta, tsp_path, num_players):
+    def __init__(self, id, name, color, initial_pos_x, initial_pos_y, stalls_to_visit, T_theta, tsp_path, num_players,
+                 tsp_service=None):
         self.id = id
         self.name = name
         self.color = color
@@ -58,7 +59,7 @@ class Player:
 
         # A point in path is a 3 variable tuple that looks like (pos_x, pos_y, "stall/point")
         self.path_to_follow = []
-        self.populate_path()
+        self.populate_path(tsp_service)
 
         self.best_rest_spot = None
 
@@ -73,7 +74,7 @@ class Player:
                 self.path_to_follow.pop(i)
                 break
 
-    def populate_path(self):
+    def populate_path(self, tsp_service=None):
         # populate the self.path_to_follow public variable
 
         stall_coordinates = [(stall.x, stall.y, stall.id)
@@ -98,9 +99,13 @@ class Player:
                         matrix[i][j] = int(round(distance))
                 return matrix
 
-            distance_matrix = compute_distance_matrix(stall_coordinates)
+            if tsp_service is not None:
+                # the simulator's shared tour
+                optimal_order = tsp_service.tour()
+            else:
+                distance_matrix = compute_distance_matrix(stall_coordinates)
 
-            optimal_order = fast_tsp.find_tour(distance_matrix)
+                optimal_order = fast_tsp.find_tour(distance_matrix)
 
             for index in optimal_order:
                 stall = self.stalls_to_visit[index]
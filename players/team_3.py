@@ -7,7 +7,8 @@ from collections import deque
 from itertools import chain
 
 class Player:
-    def __init__(self, id, name, color, initial_pos_x, initial_pos_y, stalls_to_visit, T_theta, tsp_path, num_players):
+    def __init__(self, id, name, color, initial_pos_x, initial_pos_y, stalls_to_visit, T_theta, tsp_path, num_players,
+                 tsp_service=None):
         self.id = id
         self.name = name
         self.color = color
@@ -30,11 +31,9 @@ class Player:
 
         ###TSP Implementation from team 5's first implementation###
 
-        #initiating dist as a 2D list with zeros to store distance points
-        self.dists = [[0 for _ in range(self.num_stalls + 1)] for _ in range(self.num_stalls + 1)]
         self.q = deque() # stores the path or the sequence of stalls a player will visist
 
-        self.tsp()
+        self.tsp(tsp_service)
         self.path_queue()
         self.encounter_obs = False
         self.obstacle_queue = []
@@ -55,8 +54,15 @@ class Player:
                 stall = stv[i - 1]
                 if stall not in self.q:
                     self.q.append(stv[i-1])
-    def tsp(self):
+    def tsp(self, tsp_service=None):
         '''Calculates the Traveling Salesman Problem (TSP) path for the player, which is a sequence of stalls to visit in the optimal order.'''
+        if tsp_service is not None:
+            # the simulator's shared tour, from our position (node 0)
+            self.tsp_path = [0] + [i + 1 for i in tsp_service.tour((self.pos_x, self.pos_y))]
+            return
+
+        #initiating dist as a 2D list with zeros to store distance points
+        self.dists = [[0 for _ in range(self.num_stalls + 1)] for _ in range(self.num_stalls + 1)]
         stv = self.stalls_to_visit
         n = self.num_stalls
         x,y = self.pos_x, self.pos_y
@@ -181,7 +181,8 @@ class Location:
         return False
 
 class Player:
-    def __init__(self, id, name, color, initial_pos_x, initial_pos_y, stalls_to_visit, T_theta, tsp_path, num_players):
+    def __init__(self, id, name, color, initial_pos_x, initial_pos_y, stalls_to_visit, T_theta, tsp_path, num_players,
+                 tsp_service=None):
         self.id = id
         self.name = name
         self.color = color
@@ -204,7 +205,6 @@ class Player:
         self.action = 'move'
 
         # team 5 vars
-        self.dists = [[0 for _ in range(self.num_stalls + 1)] for _ in range(self.num_stalls + 1)]
         self.paths = []
         self.reroute = []
         # var to count how long to be in obstacle avoidance mode
@@ -216,7 +216,7 @@ class Player:
         self.obstacles = {}
         self.counter = -1
 
-        self.tsp()
+        self.tsp(tsp_service)
         self.queue_path()
         self.in_endgame = False
         self.end_x = 0
@@ -231,7 +231,13 @@ class Player:
             self.paths.append(stv[i - 1])
 
     # get tsp in relation to us
-    def tsp(self):
+    def tsp(self, tsp_service=None):
+        if tsp_service is not None:
+            # the simulator's shared tour, from our position (node 0)
+            self.tsp_path = [0] + [i + 1 for i in tsp_service.tour((self.pos_x, self.pos_y))]
+            return
+
+        self.dists = [[0 for _ in range(self.num_stalls + 1)] for _ in range(self.num_stalls + 1)]
         stv = self.stalls_to_visit
         n = self.num_stalls
         px, py = self.pos_x, self.pos_y
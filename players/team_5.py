@@ -35,7 +35,8 @@ class Point():
         return (self.x / 5, 0.0, self.y / 5)
 
 class Player:
-    def __init__(self, id, name, color, initial_pos_x, initial_pos_y, stalls_to_visit, T_theta, tsp_path, num_players):
+    def __init__(self, id, name, color, initial_pos_x, initial_pos_y, stalls_to_visit, T_theta, tsp_path, num_players,
+                 tsp_service=None):
         self.id = id
         self.name = name
         self.color = color
@@ -54,10 +55,9 @@ class Player:
         self.sign_y = 1
 
         # global pathing
-        self.dists = [[0 for _ in range(self.num_stalls + 1)] for _ in range(self.num_stalls + 1)]
         self.q = deque()
         self.need_update = True
-        self.__init_tsp()
+        self.__init_tsp(tsp_service)
         self.__init_queue()
 
         # init rvo and environment boundary
@@ -74,6 +74,8 @@ class Player:
         self.collision = 0
         self.is_alert = False
         self.seen_obs = set()
+        self.obs_pos = []
+        self.looked_up = False
 
     def __init_queue(self):
         stv = self.stalls_to_visit
@@ -82,7 +84,13 @@ class Player:
         for i in tsp[1:]:
             self.q.append(stv[i-1])
 
-    def __init_tsp(self):
+    def __init_tsp(self, tsp_service=None):
+        if tsp_service is not None:
+            # the simulator's shared tour, from our position (node 0)
+            self.tsp_path = [0] + [i + 1 for i in tsp_service.tour((self.pos_x, self.pos_y))]
+            return
+
+        self.dists = [[0 for _ in range(self.num_stalls + 1)] for _ in range(self.num_stalls + 1)]
         stv = self.stalls_to_visit
         n = self.num_stalls
         px, py = self.pos_x, self.pos_y
@@ -115,6 +123,29 @@ class Player:
         # self
         self.agent = self.sim.addAgent((self.pos_x, self.pos_y))
 
+    # the rvo simulator cannot be pickled, so snapshots leave it out and it is
+    # rebuilt from our position, the obstacles seen and the players last seen
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["sim"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__init_rvo()
+        for ox, oy in self.obs_pos:
+            self.sim.addObstacle(Player.__build_poly(ox, oy))
+        if self.looked_up:
+            self.sim.processObstacles()
+
+        # the other agents keep their ids, the ones kept for reuse are parked
+        positions = {aid: self.prev_pos[pid] for pid, aid in self.agent_id.items()}
+        last = max(list(positions) + list(self.agent_q), default=self.agent)
+        for aid in range(self.agent + 1, last + 1):
+            self.sim.addAgent(positions.get(aid, (-1, -1)))
+            if aid in self.agent_q or aid not in positions:
+                self.__kill_agent(aid)
+
     @staticmethod
     def __calc_distance(x1, y1, x2, y2):
         return math.sqrt((x1 - x2)**2 + (y1 - y2)**2)
@@ -169,9 +200,11 @@ class Player:
         for oid, ox, oy in obstacles:
             if oid not in seen:
                 seen.add(oid)
+                self.obs_pos.append((ox, oy))
                 sim.addObstacle(Player.__build_poly(ox, oy))
 
         sim.processObstacles()
+        self.looked_up = True
 
         killed = []
         for pid in self.agent_id:
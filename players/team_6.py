@@ -115,7 +115,8 @@ class Vector:
         self.y = new_val.y
 
 class Player:
-    def __init__(self, id, name, color, initial_pos_x, initial_pos_y, stalls_to_visit, T_theta, tsp_path, num_players):
+    def __init__(self, id, name, color, initial_pos_x, initial_pos_y, stalls_to_visit, T_theta, tsp_path, num_players,
+                 tsp_service=None):
         self.id = id
         self.name = name
         self.color = color
@@ -138,7 +139,7 @@ class Player:
         self.pos_last_lkp = Vector(initial_pos_x, initial_pos_y)
         self.should_lookup = True # there could be obstacles near to the initial position
 
-        self.__tsp()
+        self.__tsp(tsp_service)
         self.times_lkp = 0
 
         self.dir = self.pos.normalized_dir(self.__next_stall()) # unit vector representing direction of movement
@@ -149,24 +150,28 @@ class Player:
         theta = random.random() * 2 * math.pi
         return Vector(math.cos(theta), math.sin(theta))
     
-    def __tsp(self):
+    def __tsp(self, tsp_service=None):
         stalls = self.all_stalls
         num = len(self.all_stalls)
-        distances = [[0 for _ in range(num + 1)] for _ in range(num + 1)]
-
-        for i in range(num):
-            currVector =  Vector(stalls[i].x, stalls[i].y)
-            dist = self.pos.dist2(currVector)
-            distances[0][i+1] = math.ceil(dist)
-
-        for i in range(num):
-            for j in range(num):
-                currVector1 = Vector(stalls[i].x, stalls[i].y)
-                currVector2 = Vector(stalls[j].x, stalls[j].y)
-                dist = currVector1.dist2(currVector2)
-                distances[i+1][j+1] = math.ceil(dist)
-                
-        self.tsp_path = fast_tsp.find_tour(distances)
+        if tsp_service is not None:
+            # the simulator's shared tour, from our position (node 0)
+            self.tsp_path = [0] + [i + 1 for i in tsp_service.tour((self.pos.x, self.pos.y))]
+        else:
+            distances = [[0 for _ in range(num + 1)] for _ in range(num + 1)]
+
+            for i in range(num):
+                currVector =  Vector(stalls[i].x, stalls[i].y)
+                dist = self.pos.dist2(currVector)
+                distances[0][i+1] = math.ceil(dist)
+
+            for i in range(num):
+                for j in range(num):
+                    currVector1 = Vector(stalls[i].x, stalls[i].y)
+                    currVector2 = Vector(stalls[j].x, stalls[j].y)
+                    dist = currVector1.dist2(currVector2)
+                    distances[i+1][j+1] = math.ceil(dist)
+
+            self.tsp_path = fast_tsp.find_tour(distances)
         to_print = []
         for i in self.tsp_path[1:]:
             self.stalls_next.append(self.all_stalls[i-1])
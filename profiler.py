@@ -0,0 +1,107 @@
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+
+class PhaseProfiler():
+    """Time spent in each phase of every turn.
+
+    The engine calls start_turn() and end_turn() around a turn and mark(name)
+    at the end of every phase, which charges the time since the previous
+    mark to that phase; add() charges time measured elsewhere, such as the
+    moves of one team. report() gives the total of every phase and its
+    percentiles over the turns.
+    """
+
+    def __init__(self):
+        self.turns = 0
+        self.phases = {}
+        self._current = {}
+        self._start = 0.0
+        self._last = 0.0
+
+    def start_turn(self):
+        self._current = {}
+        self._start = self._last = time.perf_counter()
+
+    def mark(self, name, exclude=0.0):
+        # exclude: time already charged with add() since the previous mark
+        now = time.perf_counter()
+        self._current[name] = self._current.get(name, 0.0) + now - self._last - exclude
+        self._last = now
+
+    def add(self, name, seconds):
+        self._current[name] = self._current.get(name, 0.0) + seconds
+
+    def end_turn(self):
+        self._current["turn"] = time.perf_counter() - self._start
+        for name, seconds in self._current.items():
+            if name not in self.phases:
+                self.phases[name] = [0.0] * self.turns
+            self.phases[name].append(seconds)
+        for name, values in self.phases.items():
+            if len(values) == self.turns:
+                values.append(0.0)
+        self.turns += 1
+
+    def report(self):
+        if self.turns == 0:
+            return "No turns profiled\n"
+
+        total = sum(self.phases["turn"])
+        text = "Phase".ljust(32) + "Total (s)".rjust(12) + "Share".rjust(9) + "Mean (ms)".rjust(12) + \
+            "p50 (ms)".rjust(12) + "p90 (ms)".rjust(12) + "p99 (ms)".rjust(12) + "Max (ms)".rjust(12) + "\n"
+        names = sorted((name for name in self.phases if name != "turn"), key=lambda name: -sum(self.phases[name]))
+        for name in names + ["turn"]:
+            values = np.array(self.phases[name]) * 1000
+            p50, p90, p99 = np.percentile(values, [50, 90, 99])
+            text += name.ljust(32) + ("%.3f" % (values.sum() / 1000)).rjust(12) + \
+                ("%.1f%%" % (100 * values.sum() / 1000 / total if total > 0 else 0)).rjust(9) + \
+                ("%.3f" % values.mean()).rjust(12) + ("%.3f" % p50).rjust(12) + ("%.3f" % p90).rjust(12) + \
+                ("%.3f" % p99).rjust(12) + ("%.3f" % values.max()).rjust(12) + "\n"
+        return text + str(self.turns) + " turns\n"
+
+
+class StackSampler():
+    """Samples the stack of one thread into collapsed stacks.
+
+    A background thread looks at the target thread's stack every `interval`
+    seconds; write() saves one "outer;...;inner count" line per distinct
+    stack, the input format of flame graph tools.
+    """
+
+    def __init__(self, interval=0.001, thread=None):
+        self.interval = interval
+        self.thread_id = (thread or threading.current_thread()).ident
+        self.counts = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(os.path.basename(code.co_filename) + ":" + code.co_name)
+                frame = frame.f_back
+            if stack:
+                key = ";".join(reversed(stack))
+                self.counts[key] = self.counts.get(key, 0) + 1
+
+    def write(self, path):
+        with open(path, "w") as f:
+            for stack, count in sorted(self.counts.items(), key=lambda item: -item[1]):
+                f.write(stack + " " + str(count) + "\n")
@@ -0,0 +1,126 @@
+import json
+import struct
+
+import numpy as np
+
+# replay file layout:
+#   MAGIC, a little endian uint32 with the length of the header, the header as
+#   JSON (padded with spaces to a multiple of 8 bytes), then one fixed size
+#   frame per turn, starting with the positions before the first turn
+MAGIC = b"DODGEMR1"
+
+# action codes
+ACTION_NONE = 0
+ACTION_LOOKUP = 1
+ACTION_MOVE = 2
+ACTION_LOOKUP_MOVE = 3
+
+ACTIONS = {'lookup': ACTION_LOOKUP, 'move': ACTION_MOVE, 'lookup move': ACTION_LOOKUP_MOVE}
+
+# event bits
+EVENT_PLAYER = 1    # collided with another player
+EVENT_OBSTACLE = 2  # collided with an obstacle
+EVENT_BOUNDARY = 4  # collided with the edge of the board
+EVENT_PICKUP = 8    # collected an item
+
+
+def frame_dtype(num_players):
+    # one turn of a game with num_players players
+    return np.dtype([
+        ("x", "<f4", (num_players,)),
+        ("y", "<f4", (num_players,)),
+        ("action", "u1", (num_players,)),
+        ("events", "u1", (num_players,)),
+        ("items", "<u2", (num_players,)),
+        ("interaction", "<u4", (num_players,)),
+        ("satisfaction", "<f4", (num_players,)),
+    ])
+
+
+class ReplayRecorder():
+    """Writes a game to a replay file, one frame per turn.
+
+    The header holds the game configuration, the players and the stall
+    layout; every frame holds the position, action, events, items,
+    interaction and satisfaction of every player at the end of a turn.
+    """
+
+    def __init__(self, path, sim):
+        self.path = path
+        self.dtype = frame_dtype(sim.num_players)
+        self.frame = np.zeros((), dtype=self.dtype)
+        self.turns = 0
+
+        visit = set(stall.id for stall in sim.stalls_to_visit)
+        header = {
+            "no_of_stalls": sim.no_of_stalls,
+            "no_to_visit": sim.no_to_visit,
+            "theta": sim.theta,
+            "T": sim.T,
+            "first_turn": sim.iteration,
+            "seed": sim.config.seed,
+            "players": [[state.id, state.name, state.color] for state in sim.player_states],
+            "stalls": [[stall.id, stall.x, stall.y, stall.id in visit] for stall in sim.stalls],
+            "tsp_path": [int(i) for i in sim.tsp_path],
+        }
+        data = json.dumps(header).encode("utf-8")
+        data += b" " * (-(len(MAGIC) + 4 + len(data)) % 8)
+
+        self.file = open(path, "wb")
+        self.file.write(MAGIC + struct.pack("<I", len(data)) + data)
+        self.record(sim.store)
+
+    def record(self, store):
+        frame = self.frame
+        frame["x"] = store.pos_x
+        frame["y"] = store.pos_y
+        frame["action"] = store.action
+        frame["events"] = store.events
+        frame["items"] = store.items
+        frame["interaction"] = store.interaction
+        frame["satisfaction"] = store.satisfaction
+        self.file.write(frame.tobytes())
+        self.turns += 1
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class Replay():
+    """A recorded game, memory mapped.
+
+    frames[t] is the state after turn first_turn + t (frames[0] is the start
+    of the recording, the start of the game unless it was restored from a
+    snapshot), so seeking to any turn is a single index into the file.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(path + " is not a replay file")
+            size = struct.unpack("<I", f.read(4))[0]
+            self.header = json.loads(f.read(size).decode("utf-8"))
+
+        self.players = self.header["players"]
+        self.stalls = self.header["stalls"]
+        self.T = self.header["T"]
+        self.first_turn = self.header.get("first_turn", 0)
+        self.num_players = len(self.players)
+        self.dtype = frame_dtype(self.num_players)
+
+        offset = len(MAGIC) + 4 + size
+        with open(path, "rb") as f:
+            f.seek(0, 2)
+            count = (f.tell() - offset) // self.dtype.itemsize
+        if count > 0:
+            self.frames = np.memmap(path, dtype=self.dtype, mode="r", offset=offset, shape=(count,))
+        else:
+            self.frames = np.zeros(0, dtype=self.dtype)
+
+    def __len__(self):
+        return len(self.frames)
+
+    def frame(self, turn):
+        return self.frames[turn]
@@ -0,0 +1,204 @@
+import argparse
+import math
+import time
+import tkinter as tk
+
+from game_canvas import GameCanvas
+from replay import Replay
+
+SPEEDS = ["0.25", "0.5", "1", "2", "4", "8", "16", "64"]
+
+
+class ReplayStall():
+    def __init__(self, id, x, y):
+        self.id = id
+        self.x = x
+        self.y = y
+
+
+class ReplayPlayer():
+    """One player of a replay, read from the viewer's current frame."""
+
+    def __init__(self, viewer, index, id, name, color):
+        self._viewer = viewer
+        self._index = index
+        self.id = id
+        self.name = name
+        self.color = color
+
+    @property
+    def pos_x(self):
+        return float(self._viewer.frame["x"][self._index])
+
+    @property
+    def pos_y(self):
+        return float(self._viewer.frame["y"][self._index])
+
+    @property
+    def items_obtained(self):
+        return int(self._viewer.frame["items"][self._index])
+
+    @property
+    def interaction(self):
+        return int(self._viewer.frame["interaction"][self._index])
+
+    @property
+    def satisfaction(self):
+        return float(self._viewer.frame["satisfaction"][self._index])
+
+
+class ReplayViewer(GameCanvas):
+    """Plays a recorded game (see replay.py) on the game canvas.
+
+    No player code is imported or run. Every frame of the replay is memory
+    mapped, so seeking to any turn costs the same as stepping to the next one.
+    At speed 1 a turn is shown every `interval` ms, like a live game.
+    """
+
+    def __init__(self, path, scale=10, interval=100, fps=30, speed=1.0):
+        self.replay = Replay(path)
+        self.canvas_scale = scale
+        self.interval = interval
+        self.speed = speed
+        self.T = self.replay.T
+
+        self.stalls_to_visit = []
+        self.obstacles = []
+        for id, x, y, visit in self.replay.stalls:
+            if visit:
+                self.stalls_to_visit.append(ReplayStall(id, x, y))
+            else:
+                self.obstacles.append(ReplayStall(id, x, y))
+
+        self.player_states = [ReplayPlayer(self, index, id, name, color)
+                              for index, (id, name, color) in enumerate(self.replay.players)]
+
+        # the last frame of a game that was played to the end shows the results
+        self.first_turn = self.replay.first_turn
+        self.last_turn = len(self.replay) - 1
+        self.finished = self.first_turn + self.last_turn == self.T
+
+        self.game_state = "pause"
+        self.scores = None
+        self.turn = 0
+        self.frame = self.replay.frame(0)
+        self.turn_no = self.first_turn + 1
+        self._play_from = 0
+        self._play_start = 0
+
+        self._init_canvas(fps)
+
+    def play(self):
+        self._render_frame()
+        self._draw_state()
+        self.root.mainloop()
+
+    def _render_frame(self):
+        super()._render_frame()
+
+        self.seek_scale = tk.Scale(self.canvas, from_=0, to=self.last_turn, orient=tk.HORIZONTAL,
+                                   length=30 * self.canvas_scale, label="Turn", command=self._on_seek)
+        self.seek_scale.place(x=110 * self.canvas_scale, y=6 * self.canvas_scale)
+
+        self.speed_var = tk.StringVar(self.root, value=("%g" % self.speed))
+        speed_menu = tk.OptionMenu(self.canvas, self.speed_var, *SPEEDS, command=self._on_speed)
+        speed_menu.place(x=155 * self.canvas_scale, y=0.3 * self.canvas_scale)
+
+    def seek(self, turn):
+        turn = max(0, min(int(turn), self.last_turn))
+        self.turn = turn
+        self.frame = self.replay.frame(turn)
+        self.turn_no = self.first_turn + turn + 1
+
+        if self.finished and turn == self.last_turn:
+            self.game_state = "over"
+            self.scores = self._final_scores()
+        elif self.game_state == "over":
+            self.game_state = "pause"
+            self.scores = None
+            self._restore_scores()
+
+    def resume(self):
+        if self.turn == self.last_turn:
+            self.seek(0)
+        self.game_state = "resume"
+        self._play_from = self.turn
+        self._play_start = time.perf_counter()
+        self._schedule()
+
+    def pause(self):
+        if self.game_state == "resume":
+            self.game_state = "pause"
+
+    def single_step(self):
+        if self.game_state == "resume":
+            self.game_state = "pause"
+        self.seek(self.turn + 1)
+        self._draw_state()
+
+    def _advance(self, frame_start, budget):
+        if self.game_state != "resume":
+            return
+        turns = (frame_start - self._play_start) * self.speed * 1000 / max(self.interval, 1)
+        self.seek(self._play_from + math.floor(turns))
+        if self.turn == self.last_turn and self.game_state == "resume":
+            self.game_state = "pause"
+
+    def _draw_state(self):
+        super()._draw_state()
+        if int(self.seek_scale.get()) != self.turn:
+            self.seek_scale.set(self.turn)
+
+    def _on_seek(self, value):
+        if int(value) == self.turn:
+            return
+        self.seek(value)
+        self._play_from = self.turn
+        self._play_start = time.perf_counter()
+        self._draw_state()
+
+    def _on_speed(self, value):
+        self.speed = float(value)
+        self._play_from = self.turn
+        self._play_start = time.perf_counter()
+
+    def _restore_scores(self):
+        # undo _draw_results when seeking back from the end of the game
+        self.canvas.itemconfigure(self.title_comp, text="SCORES")
+        self.canvas.itemconfigure(self.header_comp, text=self._score_header())
+        for index, player_state in enumerate(self.player_states):
+            self.canvas.itemconfigure(self.circles[index], fill=player_state.color)
+        self._drawn_scores = [None] * len(self.player_states)
+
+    def _final_scores(self):
+        # same ranking as Simulation.compute_scores
+        results = []
+        for player in self.player_states:
+            satisfaction = player.satisfaction
+            if player.interaction > 0:
+                satisfaction += player.interaction * math.log2(player.interaction)
+            results.append((player.id, player.name, player.items_obtained, satisfaction))
+
+        res = sorted(results, key=lambda element: (element[2], element[3]))
+        return res[::-1]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("replay", help="Replay file recorded with main.py --replay")
+    parser.add_argument("--scale", "-sc", default=10, help="Scale factor")
+    parser.add_argument("--interval", "-i", default=100, help="Time in ms between turns at speed 1")
+    parser.add_argument("--fps", default=30, help="Frames per second drawn")
+    parser.add_argument("--speed", default=1, help="Playback speed, a multiple of --interval")
+    parser.add_argument("--turn", "-t", default=0, help="Turn to start at")
+    args = parser.parse_args()
+
+    try:
+        viewer = ReplayViewer(args.replay, scale=int(math.floor(float(args.scale))), interval=int(args.interval),
+                              fps=int(args.fps), speed=float(args.speed))
+    except (OSError, ValueError) as e:
+        print("ERROR: " + str(e))
+        raise SystemExit(1)
+
+    viewer.seek(int(args.turn))
+    viewer.play()
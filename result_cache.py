@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+
+from player_registry import player_source
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# source files that decide the outcome of every game
+ENGINE_FILES = ["simulation.py", "spatial.py", "collision.py", "player_state.py", "player_output.py",
+                "player_registry.py", "layout.py", "tsp_service.py", "game_results.py", "time_budget.py",
+                "constants.py", "world.py", "decisions.py"]
+
+
+class ResultCache():
+    """Results of games, keyed by their configuration and source code.
+
+    The key of a game is a hash of its configuration, of the engine source
+    and of the source of every team that plays in it, so changing one team
+    only invalidates that team's games. Every entry is a JSON file in
+    `directory`; reading an entry marks it as recently used and the least
+    recently used entries are removed once there are more than max_entries.
+    """
+
+    def __init__(self, directory, max_entries=20000):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._digests = {}
+        os.makedirs(directory, exist_ok=True)
+        self.count = sum(1 for entry in os.scandir(directory) if entry.name.endswith(".json"))
+
+    def _digest(self, path):
+        if path not in self._digests:
+            with open(os.path.join(ROOT, path), "rb") as f:
+                self._digests[path] = hashlib.sha256(f.read()).hexdigest()
+        return self._digests[path]
+
+    def key(self, config):
+        # config is a JSON serialisable dict, with a "players" list if players
+        # decide the value
+        sources = ENGINE_FILES + sorted(set(player_source(name) for name in config.get("players", [])))
+        data = json.dumps({"config": config, "sources": [(path, self._digest(path)) for path in sources]},
+                          sort_keys=True)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            return None
+        os.utime(path)
+        return value
+
+    def put(self, key, value):
+        path = self._path(key)
+        new = not os.path.exists(path)
+        # a temporary file of this process, as workers may write the same entry
+        tmp = path + "." + str(os.getpid()) + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(value, f)
+        os.replace(tmp, path)
+
+        if new:
+            self.count += 1
+            if self.count > self.max_entries:
+                self.evict()
+
+    def evict(self):
+        # remove the least recently used entries, down to 90% of max_entries
+        # so that the directory is not scanned again on the next put
+        keep = self.max_entries - self.max_entries // 10
+        entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".json")]
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:max(0, len(entries) - keep)]:
+            os.remove(entry.path)
+        self.count = min(len(entries), keep)
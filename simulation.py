@@ -0,0 +1,1168 @@
+import json
+import math
+import os
+import pickle
+import random
+import time
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+
+import constants
+import decisions
+import game_log
+import layout
+import player_registry
+import time_budget
+from collision import check_collision_batch
+from game_log import GameLogger
+from game_results import game_record
+from player_output import BUFFER, DISCARD, PlayerOutput
+from player_state import PlayerState, PlayerStore, dump_player
+from profiler import PhaseProfiler
+from result_cache import ResultCache
+from replay import ACTIONS, EVENT_BOUNDARY, EVENT_OBSTACLE, EVENT_PICKUP, EVENT_PLAYER, ReplayRecorder
+from spatial import NeighbourGrid, StaticGrid, lookup
+from time_budget import TimeBudget
+from tsp_service import TspService, solve_tour
+from world import load_world, save_world, world_data, world_key
+from world import random_state as world_random_state
+
+# how far from a stall centre a move can still touch it: obstacles block moves
+# within 1.5 units (see check_collision_obstacle), stalls are visited within 2
+# units (see check_visit_stall); the extra 0.01 absorbs float rounding
+OBSTACLE_REACH = 1.51
+STALL_REACH = 2.01
+LOOKUP_RADIUS = 10
+
+# snapshot format, and the PlayerStore arrays that it saves
+SNAPSHOT_VERSION = 2
+SNAPSHOT_ARRAYS = ("pos_x", "pos_y", "wait", "interaction", "items", "satisfaction")
+
+
+class Stall():
+    def __init__(self, id, x, y):
+        self.id = id
+        self.x = x
+        self.y = y
+
+
+@dataclass
+class GameConfig:
+    no_of_stalls: int = 100
+    no_to_visit: int = 50
+    theta: int = 2
+    total_time: int = -1
+    players: list = field(default_factory=lambda: ['1', '2', '3', '4', '5', '6'])
+    seed: int = 2
+    # how stalls are placed, one of layout.LAYOUTS: "legacy" gives the maps
+    # of earlier versions for the same seed
+    layout: str = "grid"
+    scale: int = 10
+    disable_tsp: bool = False
+    # directory for the text logs, None disables all file output
+    log_dir: str = None
+    # one of game_log.LEVELS and the number of turns between log flushes (0 = at the end)
+    log_level: str = "trace"
+    log_flush_every: int = 0
+    # what happens to the players' prints: "discard" or "buffer" (keep the
+    # last player_output_lines lines of every player); bytes are always counted
+    player_output: str = "discard"
+    player_output_lines: int = 100
+    # file to record the game to (see replay.py), None records nothing
+    replay: str = None
+    # file that a snapshot of the game is saved to every checkpoint_every turns
+    checkpoint: str = None
+    checkpoint_every: int = 0
+    # seconds each player may spend in one turn and in the whole game (0 is
+    # unlimited), measured on the "wall" or "cpu" clock; see time_budget.py
+    turn_budget: float = constants.turn_timeout
+    game_budget: float = constants.timeout
+    budget_clock: str = "wall"
+    preempt: bool = True
+    # time every phase of every turn, see profiler.py
+    profile: bool = False
+    # world file (see world.py) to play on instead of generating a map, and
+    # directory of a cache of generated worlds, keyed by world.world_key
+    world: str = None
+    world_cache: str = None
+    # how the players decide their moves, one of decisions.MODES, and the
+    # number of worker threads or processes (0 is one per core)
+    decisions: str = "serial"
+    decision_workers: int = 0
+
+    @classmethod
+    def from_args(cls, args, log_dir=None, log_level="trace", log_flush_every=0, player_output="discard",
+                  replay=None, checkpoint=None, checkpoint_every=0, turn_budget=constants.turn_timeout,
+                  game_budget=constants.timeout, budget_clock="wall", layout="grid"):
+        # build a config from the (string valued) command line arguments of main.py
+        return cls(no_of_stalls=int(args.no_of_stalls),
+                   no_to_visit=int(args.no_to_visit),
+                   theta=int(args.theta),
+                   total_time=int(args.total_time),
+                   players=list(args.players),
+                   seed=int(args.seed),
+                   layout=layout,
+                   scale=int(math.floor(float(args.scale))),
+                   disable_tsp=str(args.disable_tsp).lower() == "true",
+                   log_dir=log_dir,
+                   log_level=log_level,
+                   log_flush_every=log_flush_every,
+                   player_output=player_output,
+                   replay=replay,
+                   checkpoint=checkpoint,
+                   checkpoint_every=checkpoint_every,
+                   turn_budget=turn_budget,
+                   game_budget=game_budget,
+                   budget_clock=budget_clock)
+
+    def validate(self):
+        if self.no_of_stalls <= 0:
+            raise ValueError("Number of stalls has to be greater than 0")
+        if self.no_to_visit <= 0:
+            raise ValueError("Number of stalls to visit has to be greater than 0")
+        if self.log_level.lower() not in game_log.LEVELS:
+            raise ValueError("Log level has to be one of " + ", ".join(game_log.LEVELS))
+        if self.no_to_visit > self.no_of_stalls:
+            raise ValueError("Number of stalls to visit has to be lesser than the total number of stalls")
+        if self.layout not in layout.LAYOUTS:
+            raise ValueError("Layout has to be one of " + ", ".join(layout.LAYOUTS))
+        layout.check_feasible(self.no_of_stalls)
+        if len(self.players) == 0:
+            raise ValueError("At least one player is required")
+        if self.player_output not in (DISCARD, BUFFER):
+            raise ValueError("Player output has to be " + DISCARD + " or " + BUFFER)
+        if self.player_output_lines <= 0:
+            raise ValueError("Number of buffered player output lines has to be greater than 0")
+        if self.checkpoint_every < 0:
+            raise ValueError("Checkpoint interval cannot be negative")
+        if self.turn_budget < 0 or self.game_budget < 0:
+            raise ValueError("Time budgets cannot be negative")
+        if self.budget_clock not in (time_budget.WALL, time_budget.CPU):
+            raise ValueError("Time budget clock has to be " + time_budget.WALL + " or " + time_budget.CPU)
+        if self.decisions not in decisions.MODES:
+            raise ValueError("Decisions have to be made in one of " + ", ".join(decisions.MODES))
+        if self.decision_workers < 0:
+            raise ValueError("Number of decision workers cannot be negative")
+        if self.decisions == decisions.THREADS and self.budget_clock == time_budget.CPU:
+            raise ValueError("The cpu time budget clock cannot time players in worker threads")
+
+
+class Simulation():
+    """Headless game engine.
+
+    Constructing a simulation generates the map and the players; the game is
+    then advanced with step() or run() and ranked with results(). Nothing is
+    written to disk unless config.log_dir is set, so many games can be run
+    back to back in one process. snapshot() captures a game in progress,
+    which restore() continues and fork() copies.
+    """
+
+    def __init__(self, config, snapshot=None):
+        config.validate()
+        self.config = config
+
+        # seed
+        if snapshot is None:
+            random.seed(config.seed)
+
+        # time
+        self.iteration = 0
+
+        # arguments
+        self.no_of_stalls = config.no_of_stalls
+        self.no_to_visit = config.no_to_visit
+
+        # stalls and obstacles
+        self.stalls = []
+        self.stalls_to_visit = []
+        self.obstacles = []
+
+        # player
+        self.players = []
+        self.player_states = []
+        self.num_players = len(config.players)
+
+        # distances between the stalls to visit, see calculate_distance
+        self.dist_matrix = None
+
+        self.theta = config.theta
+        self.T = 0
+        # length of the reference tour, T is theta times this rounded up
+        self.tour_length = 0.0
+        # seconds spent solving it when the game was set up
+        self.tsp_time = 0.0
+
+        # log files
+        self.log_dir = config.log_dir
+        self.logger = GameLogger(config.log_dir, config.log_level, config.log_flush_every)
+        self._init_logs()
+
+        self.canvas_scale = config.scale
+
+        self.turn_no = 1
+        self.game_state = "resume"
+        self.scores = None
+
+        # seconds spent playing turns, in total and in each player's moves
+        self.elapsed = 0.0
+        self.decision_time = [0.0] * self.num_players
+        self.budget = TimeBudget(self.num_players, config.turn_budget, config.game_budget,
+                                 config.budget_clock, config.preempt)
+        self.profiler = PhaseProfiler() if config.profile else None
+        # the random streams of the players in a parallel decision mode
+        self.streams = None
+
+        # one sink for the players' prints, for the whole game
+        self.player_output = PlayerOutput(self.num_players, config.player_output, config.player_output_lines)
+
+        if snapshot is None:
+            self._new_game()
+        else:
+            self._restore(snapshot)
+
+        # stalls never move after the map is built, so they are indexed once
+        self.obstacle_grid = StaticGrid(self.obstacles)
+        self.stall_grid = StaticGrid(self.stalls_to_visit)
+        self._index_players()
+
+        self.decisions = None
+        if config.decisions != decisions.SERIAL:
+            if self.streams is None:
+                self.streams = [decisions.Stream(random.getrandbits(64)) for _ in self.players]
+            self.decisions = decisions.DecisionPool(config.decisions, config.decision_workers, self.players,
+                                                    self.streams, self.budget, config, self.obstacles, LOOKUP_RADIUS)
+            self.players = self.decisions.deferred
+
+        self.recorder = None
+        if config.replay is not None:
+            self.recorder = ReplayRecorder(config.replay, self)
+
+    def _new_game(self):
+        # the map comes from a world file, from the world cache or is generated
+        world, cache = None, None
+        if self.config.world is not None:
+            world = load_world(self.config.world)
+        elif self.config.world_cache is not None:
+            cache = ResultCache(self.config.world_cache)
+            key = cache.key(world_key(self.config))
+            world = cache.get(key)
+
+        if world is not None:
+            self._load_world(world)
+        else:
+            self._configure_game()
+            self.calculate_distance()
+            if not self.config.disable_tsp:
+                start = time.perf_counter()
+                self.T, self.tsp_path = self.tsp()
+                self.tsp_time = time.perf_counter() - start
+            else:
+                self.T, self.tsp_path = 10000, []
+            if cache is not None:
+                cache.put(key, world_data(self, random.getstate()))
+        if self.logger.enabled(game_log.RESULTS):
+            save_world(os.path.join(self.log_dir, "world.json"), world_data(self))
+
+        # handle edge case
+        if self.T <= 0:
+            self.T = 1000
+
+        self.logger.write("tsp.txt", str(self.tsp_path))
+        self.tsp_service = TspService(self.stalls_to_visit, self.dist_matrix, self.tsp_path)
+
+        self.T = self.theta * self.T
+
+        if self.config.total_time > 0:
+            self.T = self.config.total_time
+
+        with redirect_stdout(self.player_output):
+            self._create_players(self.config.players)
+        self._open_player_logs()
+
+    def _load_world(self, world):
+        # a world of world.py; the numbers of stalls come from the world
+        stalls = {}
+        for id, x, y in world["stalls"]:
+            stalls[id] = Stall(id, x, y)
+        self.stalls = list(stalls.values())
+        self.stalls_to_visit = [stalls[id] for id in world["visit"]]
+        visit = set(world["visit"])
+        self.obstacles = [stall for stall in self.stalls if stall.id not in visit]
+        self.no_of_stalls = len(self.stalls)
+        self.no_to_visit = len(self.stalls_to_visit)
+        if self.logger.enabled(game_log.RESULTS):
+            self._log_stalls()
+        self.calculate_distance()
+
+        if self.config.disable_tsp:
+            self.T, self.tsp_path = 10000, []
+        elif "tour" in world:
+            self.tsp_path = list(world["tour"])
+            self.tour_length = world["tour_length"]
+            self.T = math.ceil(self.tour_length)
+        else:
+            self.T, self.tsp_path = self.tsp()
+
+        state = world_random_state(world)
+        if state is not None:
+            random.setstate(state)
+
+    def snapshot(self):
+        # the complete state of the game as bytes; players are pickled, so a
+        # player can control what is saved with __getstate__/__setstate__
+        store = self.store
+        players, streams = self.players, None
+        if self.decisions is not None:
+            with redirect_stdout(self.player_output):
+                players, streams = self.decisions.state(self.player_output)
+        state = {
+            "version": SNAPSHOT_VERSION,
+            "config": self.config,
+            "iteration": self.iteration,
+            "turn_no": self.turn_no,
+            "T": self.T,
+            "game_state": self.game_state,
+            "scores": self.scores,
+            "elapsed": self.elapsed,
+            "decision_time": list(self.decision_time),
+            "budget": (list(self.budget.used), list(self.budget.violations), list(self.budget.skipped)),
+            "tsp_path": list(self.tsp_path),
+            "stalls": [(stall.id, stall.x, stall.y) for stall in self.stalls],
+            "stalls_to_visit": [stall.id for stall in self.stalls_to_visit],
+            "store": {name: getattr(store, name).copy() for name in SNAPSHOT_ARRAYS},
+            "player_states": [(state.id, state.name, state.color, state.T_theta, list(state.visited_stalls))
+                              for state in self.player_states],
+            "players": [dump_player(player, index, self.config.players[index]) for index, player in enumerate(players)],
+            "streams": [stream.getstate() for stream in streams] if streams is not None else None,
+            "random": random.getstate(),
+            "np_random": np.random.get_state(),
+        }
+        return pickle.dumps(state, pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def restore(cls, data, config_changes=None, **kwargs):
+        # continue a game from snapshot() bytes; the restored game writes no
+        # logs, replay or checkpoints unless config_changes asks for them
+        state = pickle.loads(data)
+        if not isinstance(state, dict) or state.get("version") != SNAPSHOT_VERSION:
+            raise ValueError("Unsupported snapshot version")
+        changes = {"log_dir": None, "replay": None, "checkpoint": None}
+        changes.update(config_changes or {})
+        return cls(replace(state["config"], **changes), snapshot=state, **kwargs)
+
+    def fork(self, config_changes=None, **kwargs):
+        # an independent copy of the game, continuing from the current turn;
+        # players share the global random module, so a fork and its origin
+        # only play the same turns when they are run one after the other
+        return self.restore(self.snapshot(), config_changes, **kwargs)
+
+    def save_checkpoint(self, path):
+        # written to a temporary file first, so a crash never leaves a partial snapshot
+        data = self.snapshot()
+        with open(path + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)
+
+    def _restore(self, state):
+        stalls = {}
+        for id, x, y in state["stalls"]:
+            stalls[id] = Stall(id, x, y)
+        self.stalls = list(stalls.values())
+        self.stalls_to_visit = [stalls[id] for id in state["stalls_to_visit"]]
+        visit = set(state["stalls_to_visit"])
+        self.obstacles = [stall for stall in self.stalls if stall.id not in visit]
+        self.calculate_distance()
+        if self.logger.enabled(game_log.RESULTS):
+            self._log_stalls()
+
+        self.T = state["T"]
+        self.tsp_path = state["tsp_path"]
+        self.tour_length = self._tour_length(self.tsp_path)
+        self.logger.write("tsp.txt", str(self.tsp_path))
+        self.tsp_service = TspService(self.stalls_to_visit, self.dist_matrix, self.tsp_path)
+
+        self.store = PlayerStore(self.num_players)
+        stalls_to_visit = tuple(self.stalls_to_visit)
+        tsp_path = tuple(self.tsp_path)
+        for index, (id, name, color, T_theta, visited) in enumerate(state["player_states"]):
+            player_state = PlayerState(id, name, color, 0, 0, stalls_to_visit, T_theta, tsp_path, self.store, index)
+            for stall_id in visited:
+                player_state.add_stall_visited(stall_id)
+            self.player_states.append(player_state)
+
+        # after the views, which reset their player's entries
+        for name in SNAPSHOT_ARRAYS:
+            getattr(self.store, name)[:] = state["store"][name]
+
+        with redirect_stdout(self.player_output):
+            self.players = [pickle.loads(blob) for blob in state["players"]]
+        self._open_player_logs()
+
+        self.iteration = state["iteration"]
+        self.turn_no = state["turn_no"]
+        self.game_state = state["game_state"]
+        self.scores = state["scores"]
+        self.elapsed = state["elapsed"]
+        self.decision_time = state["decision_time"]
+        self.budget.used, self.budget.violations, self.budget.skipped = state["budget"]
+        random.setstate(state["random"])
+        np.random.set_state(state["np_random"])
+        if state.get("streams") is not None:
+            self.streams = []
+            for stream_state in state["streams"]:
+                self.streams.append(decisions.Stream(0))
+                self.streams[-1].setstate(stream_state)
+
+    def _init_logs(self):
+        self.logger.open("result.txt", game_log.RESULTS, "Results\n")
+        self.logger.open("result.jsonl", game_log.RESULTS)
+        if self.config.profile:
+            self.logger.open("profile.txt", game_log.RESULTS, "Turn Phases\n")
+        self.logger.open("stall.txt", game_log.RESULTS, "Stall Info\n")
+        self.logger.open("score.txt", game_log.SUMMARY, "Score Info\n")
+        self.logger.open("tsp.txt", game_log.RESULTS, "Travelling Salesman Path\n")
+        self.logger.open("player_output.txt", game_log.RESULTS, "Player Output\n")
+        self.logger.open("game_config.txt", game_log.RESULTS, self.format_config())
+
+    def format_config(self):
+        return "\nGame Configuration\n\
+Total Number of Stalls: " + str(self.no_of_stalls) + "\n\
+Number of Stalls to Visit: " + str(self.no_to_visit) + "\n\
+Number of Obstacles: " + str(self.no_of_stalls - self.no_to_visit) + "\n\
+Players: " + str(self.config.players) + "\n\
+Theta: " + str(self.theta) + "\n\
+Total Time: " + str(self.T) + "\n\n"
+
+    def calculate_distance(self):
+        # distances between the stalls to visit; the matrix is read-only, so it
+        # can be handed to anything in the engine without being copied
+        x = np.array([stall.x for stall in self.stalls_to_visit], dtype=float)
+        y = np.array([stall.y for stall in self.stalls_to_visit], dtype=float)
+        dist = np.subtract.outer(x, x)
+        dist *= dist
+        dy = np.subtract.outer(y, y)
+        dy *= dy
+        dist += dy
+        np.sqrt(dist, out=dist)
+        dist.flags.writeable = False
+        self.dist_matrix = dist
+
+    def tsp(self):
+        # obtain tour using a deterministic travelling salesman approximation,
+        # so that a seed always gives the same tour and T
+        tour = solve_tour(self.dist_matrix)
+
+        # calculate path length
+        self.tour_length = self._tour_length(tour)
+
+        T = math.ceil(self.tour_length)
+        return T, tour
+
+    def _tour_length(self, tour):
+        return float(self.dist_matrix[tour[:-1], tour[1:]].sum())
+
+    def _configure_game(self):
+        # create stalls
+        for id, (x, y) in enumerate(layout.place_stalls(self.no_of_stalls, self.config.layout), 1):
+            self.stalls.append(Stall(id, x, y))
+
+        # stalls to visit by players
+        self.stalls_to_visit = random.sample(self.stalls, self.no_to_visit)
+
+        # obstacles
+        visit = set(stall.id for stall in self.stalls_to_visit)
+        self.obstacles = [stall for stall in self.stalls if stall.id not in visit]
+
+        if self.logger.enabled(game_log.RESULTS):
+            self._log_stalls()
+
+    def _log_stalls(self):
+        f = self.logger.file("stall.txt")
+        f.write("_"*250 + "\n\n")
+        f.write("STALLS\n")
+        f.write("_"*250 + "\n\n")
+        f.write("Stall ID".ljust(20, " ") + "Stall Position (Center)".ljust(50, " ") + "Vertex 1 (Top Left)".ljust(50, " ") +
+                "Vertex 2 (Top Right)".ljust(50, " ") + "Vertex 3 (Bottom Right)".ljust(50, " ") + "Vertex 4 (Bottom Left)".ljust(50, " ") + "\n")
+        f.write("_"*250 + "\n\n")
+        for stall in self.stalls:
+            c1x, c1y = stall.x - 1, stall.y - 1
+            c2x, c2y = stall.x + 1, stall.y - 1
+            c3x, c3y = stall.x + 1, stall.y + 1
+            c4x, c4y = stall.x - 1, stall.y + 1
+            str1 = "(" + str(stall.x) + ", " + str(stall.y) + ")"
+            str2 = "(" + str(c1x) + ", " + str(c1y) + ")"
+            str3 = "(" + str(c2x) + ", " + str(c2y) + ")"
+            str4 = "(" + str(c3x) + ", " + str(c3y) + ")"
+            str5 = "(" + str(c4x) + ", " + str(c4y) + ")"
+            f.write(str(stall.id).ljust(20) + str1.ljust(50, " ") + str2.ljust(50, " ") +
+                    str3.ljust(50, " ") + str4.ljust(50, " ") + str5.ljust(50, " ") + "\n")
+
+        f.write("\n\n" + "_"*250 + "\n\n")
+        f.write("STALLS TO VISIT\n")
+        f.write("_"*250 + "\n\n")
+        f.write("Stall ID".ljust(20, " ") +
+                "Stall Position".ljust(50, " ") + "\n")
+        f.write("_"*250 + "\n\n")
+        for index, stall in enumerate(self.stalls_to_visit):
+            str1 = "(" + str(stall.x) + ", " + str(stall.y) + ")"
+            f.write(str(stall.id).ljust(20) + str1.ljust(50, " ") + "\n")
+
+        f.write("\n\n" + "_"*250 + "\n\n")
+        f.write("OBSTACLES\n")
+        f.write("_"*250 + "\n\n")
+        f.write("Stall ID".ljust(20, " ") +
+                "Stall Position".ljust(50, " ") + "\n")
+        f.write("_"*250 + "\n\n")
+        for index, stall in enumerate(self.obstacles):
+            str1 = "(" + str(stall.x) + ", " + str(stall.y) + ")"
+            f.write(str(stall.id).ljust(20) + str1.ljust(50, " ") + "\n")
+
+    def _create_players(self, player_names):
+        no_of_players = len(player_names)
+
+        # create randomized positions
+        perimeter = 400
+        mod = math.floor(perimeter / no_of_players)
+        positions = []
+
+        for i in range(no_of_players):
+            if mod > 0:
+                pos = mod * i + random.randint(1, mod)
+            else:
+                # more players than perimeter units, spread them evenly
+                pos = perimeter * (i + random.random()) / no_of_players
+            if 0 <= pos <= 100:
+                pos_x = 0
+                pos_y = pos
+            elif 100 < pos <= 200:
+                pos_x = pos - 100
+                pos_y = 100
+            elif 200 < pos <= 300:
+                pos_x = 100
+                pos_y = 300 - pos
+            else:
+                pos_x = 400 - pos
+                pos_y = 0
+            positions.append([pos_x, pos_y])
+
+        random.shuffle(positions)
+
+        # every player shares the same tuples: players only read them, and a
+        # 1000 player game then holds one copy instead of 2000
+        stalls_to_visit = tuple(self.stalls_to_visit)
+        tsp_path = tuple(self.tsp_path)
+
+        self.store = PlayerStore(no_of_players)
+        for index, name in enumerate(player_names):
+            self.player_output.player = index
+            color = player_registry.player_color(name)
+            state = PlayerState(index + 1, name, color, positions[index][0], positions[index][1], stalls_to_visit,
+                                self.T, tsp_path, self.store, index)
+            # players that take it share the game's distances and tours
+            options = {"tsp_service": self.tsp_service} if player_registry.accepts(name, "tsp_service") else {}
+            player = player_registry.player_class(name)(index + 1, name, color, positions[index][0], positions[index][1],
+                                                        stalls_to_visit, self.T, tsp_path, self.num_players, **options)
+            self.players.append(player)
+            self.player_states.append(state)
+
+    def _open_player_logs(self):
+        # one trace log per player
+        self.player_logs = []
+        for state in self.player_states:
+            name = "player " + str(state.id) + " team " + str(state.name) + ".txt"
+            self.logger.open(name, game_log.TRACE, "Player Moves\n")
+            self.player_logs.append(name)
+
+    def compute_distance(self, x1, y1, x2, y2):
+        return math.sqrt((x1 - x2)**2 + (y1 - y2)**2)
+
+    def intersection(self, a, b, c, d, e, f, g, h):
+        s0 = [(a, b), (c, d)]
+        s1 = [(e, f), (g, h)]
+        dx0 = s0[1][0]-s0[0][0]
+        dx1 = s1[1][0]-s1[0][0]
+        dy0 = s0[1][1]-s0[0][1]
+        dy1 = s1[1][1]-s1[0][1]
+        p0 = dy1*(s1[1][0]-s0[0][0]) - dx1*(s1[1][1]-s0[0][1])
+        p1 = dy1*(s1[1][0]-s0[1][0]) - dx1*(s1[1][1]-s0[1][1])
+        p2 = dy0*(s0[1][0]-s1[0][0]) - dx0*(s0[1][1]-s1[0][1])
+        p3 = dy0*(s0[1][0]-s1[1][0]) - dx0*(s0[1][1]-s1[1][1])
+        return (p0*p1 <= 0) & (p2*p3 <= 0)
+
+    def check_collision_obstacle(self, stall_id, stall_x, stall_y, p_x, p_y, new_p_x, new_p_y, color):
+        #
+        #                  Segment 1
+        #                       c1x, c1y - 0.5      c2x, c2y - 0.5
+        #                           |                   |
+        #                           |                   |
+        #    c1x - 0.5, c1y ----  c1x, c1y -------- c2x, c2y ---- c2x + 0.5, c2y
+        #                   |       |                   |
+        #                   |       |                   |
+        #                 Segment 4 |      Obstacle     | Segment 2
+        #                   |       |                   |
+        #                   |       |                   |
+        #     c4x - 0.5, c4y ---- c4x, c4y -------- c3x, c3y ---- c3x + 0.5, c3y
+        #                           |                   |
+        #                           |                   |
+        #                         c4x, c4y + 0.5    c3x, c3y + 0.5
+        #                  Segment 3
+
+        c1x, c1y = stall_x - 1, stall_y - 1
+        c2x, c2y = stall_x + 1, stall_y - 1
+        c3x, c3y = stall_x + 1, stall_y + 1
+        c4x, c4y = stall_x - 1, stall_y + 1
+
+        if self.intersection(c1x, c1y - 0.5, c2x, c2y - 0.5, p_x, p_y, new_p_x, new_p_y):
+            return True
+        if self.intersection(c2x + 0.5, c2y, c3x + 0.5, c3y, p_x, p_y, new_p_x, new_p_y):
+            return True
+        if self.intersection(c3x, c3y + 0.5, c4x, c4y + 0.5, p_x, p_y, new_p_x, new_p_y):
+            return True
+        if self.intersection(c4x - 0.5, c4y, c1x - 0.5, c1y, p_x, p_y, new_p_x, new_p_y):
+            return True
+        if self.check_collision(c1x, c1y, c1x, c1y, p_x, p_y, new_p_x, new_p_y):
+            return True
+
+        if self.check_collision(c2x, c2y, c2x, c2y, p_x, p_y, new_p_x, new_p_y):
+            return True
+
+        if self.check_collision(c3x, c3y, c3x, c3y, p_x, p_y, new_p_x, new_p_y):
+            return True
+
+        if self.check_collision(c4x, c4y, c4x, c4y, p_x, p_y, new_p_x, new_p_y):
+            return True
+
+        return False
+
+    def check_visit_stall(self, stall_id, stall_x, stall_y, p_x, p_y, new_p_x, new_p_y, color):
+        #
+        #                  Segment 1
+        #                       c1x, c1y - 0.5      c2x, c2y - 0.5
+        #                           |                   |
+        #                           |                   |
+        #    c1x - 0.5, c1y ----  c1x, c1y -------- c2x, c2y ---- c2x + 0.5, c2y
+        #                   |       |                   |
+        #                   |       |                   |
+        #                 Segment 4 |        Stall      | Segment 2
+        #                   |       |                   |
+        #                   |       |                   |
+        #     c4x - 0.5, c4y ---- c4x, c4y -------- c3x, c3y ---- c3x + 0.5, c3y
+        #                           |                   |
+        #                           |                   |
+        #                         c4x, c4y + 0.5    c3x, c3y + 0.5
+        #                  Segment 3
+
+        c1x, c1y = stall_x - 1, stall_y - 1
+        c2x, c2y = stall_x + 1, stall_y - 1
+        c3x, c3y = stall_x + 1, stall_y + 1
+        c4x, c4y = stall_x - 1, stall_y + 1
+
+        if self.intersection(c1x, c1y - 1, c2x, c2y - 1, p_x, p_y, new_p_x, new_p_y):
+            return True
+        if self.intersection(c2x + 1, c2y, c3x + 1, c3y, p_x, p_y, new_p_x, new_p_y):
+            return True
+        if self.intersection(c3x, c3y + 1, c4x, c4y + 1, p_x, p_y, new_p_x, new_p_y):
+            return True
+        if self.intersection(c4x - 1, c4y, c1x - 1, c1y, p_x, p_y, new_p_x, new_p_y):
+            return True
+        if self.check_collision(c1x, c1y, c1x, c1y, p_x, p_y, new_p_x, new_p_y):
+            return True
+
+        if self.check_collision(c2x, c2y, c2x, c2y, p_x, p_y, new_p_x, new_p_y):
+            return True
+
+        if self.check_collision(c3x, c3y, c3x, c3y, p_x, p_y, new_p_x, new_p_y):
+            return True
+
+        if self.check_collision(c4x, c4y, c4x, c4y, p_x, p_y, new_p_x, new_p_y):
+            return True
+
+        if self.compute_distance(c1x, c1y, p_x, p_y) <= 1 or self.compute_distance(c2x, c2y, p_x, p_y) <= 1 or \
+                self.compute_distance(c3x, c3y, p_x, p_y) <= 1 or self.compute_distance(c4x, c4y, p_x, p_y) <= 1:
+            return True
+
+        return False
+
+    def check_inside(self, stall_x, stall_y, p_x, p_y):
+        if (p_x >= stall_x - 1 and p_x <= stall_x + 1 and p_y >= stall_y - 1 and p_y <= stall_y + 1):
+            return True
+
+        if (p_x >= stall_x - 1.5 and p_x <= stall_x - 1 and p_y >= stall_y - 1 and p_y <= stall_y + 1) or \
+           (p_x >= stall_x + 1 and p_x <= stall_x + 1.5 and p_y >= stall_y - 1 and p_y <= stall_y + 1) or \
+           (p_x >= stall_x - 1 and p_x <= stall_x + 1 and p_y >= stall_y + 1 and p_y <= stall_y + 1.5) or \
+           (p_x >= stall_x - 1 and p_x <= stall_x + 1 and p_y >= stall_y - 1.5 and p_y <= stall_y - 1) or \
+           self.compute_distance(stall_x - 1, stall_y - 1, p_x, p_y) <= 0.5 or \
+           self.compute_distance(stall_x - 1, stall_y + 1, p_x, p_y) <= 0.5 or \
+           self.compute_distance(stall_x + 1, stall_x - 1, p_x, p_y) <= 0.5 or \
+           self.compute_distance(stall_x + 1, stall_x + 1, p_x, p_y) <= 0.5:
+            return True
+        return False
+
+    def compute_scores(self):
+        results = []
+        for index, player in enumerate(self.player_states):
+            if player.interaction > 0:
+                player.satisfaction += (player.interaction *
+                                        math.log2(player.interaction))
+            results.append(
+                (player.id, player.name, player.items_obtained, player.satisfaction))
+
+        # sort by items obtained and satisfaction
+        res = sorted(results, key=lambda element: (element[2], element[3]))
+
+        return res[::-1]
+
+    def lookup(self, player):
+        # player ids are their index + 1
+        return lookup(self.player_grid, self.obstacle_grid, player.id - 1, LOOKUP_RADIUS)
+
+    def check_collision(self, x1, y1, new_x1, new_y1, x2, y2, new_x2, new_y2):
+        vx = new_x1 - x1
+        vy = new_y1 - y1
+        wx = new_x2 - x2
+        wy = new_y2 - y2
+
+        A = vx**2 + wx**2 + vy**2 + wy**2 - 2*vx*wx - 2*vy*wy
+        B = 2*x1*vx - 2*x2*vx - 2*x1*wx + 2*x2*wx + \
+            2*y1*vy - 2*y2*vy - 2*y1*wy + 2*y2*wy
+        C = x1**2 + x2**2 + y1**2 + y2**2 - 2*x1*x2 - 2*y1*y2 - 0.25
+
+        D = B**2 - 4*A*C
+
+        if A == 0:
+            if B == 0:
+                if C == 0:
+                    return True
+                else:
+                    return False
+            root = (-1 * C) / B
+            if root >= 0 and root <= 1:
+                return True
+            return False
+
+        if D < 0:
+            return False
+
+        if D == 0:
+            root = (-1 * B) / (2 * A)
+            if root >= 0 and root <= 1:
+                return True
+
+        if D > 0:
+            root1 = (-1 * B + math.sqrt(D)) / (2 * A)
+            root2 = (-1 * B - math.sqrt(D)) / (2 * A)
+
+            if root1 > 0 and root1 <= 1:
+                return True
+            if root2 > 0 and root2 <= 1:
+                return True
+
+        return False
+
+    def _index_players(self):
+        self.player_grid = NeighbourGrid(self.store.pos_x.tolist(), self.store.pos_y.tolist())
+
+    def _player_collisions(self):
+        # for every player, the indices of the players whose move collides with theirs
+        store = self.store
+        hits = [[] for _ in self.player_states]
+
+        # two players can only meet if they start within 0.5 plus both step lengths
+        steps = np.sqrt((store.pos_x - store.new_x)**2 + (store.pos_y - store.new_y)**2)
+        radius = 0.5 + 2 * float(steps.max()) + 0.01
+
+        wait = store.wait
+        pairs = [(i, j) for i, j in self.player_grid.candidate_pairs(radius)
+                 if wait[i] == 0 or wait[j] == 0]
+        if not pairs:
+            return hits
+
+        first = np.array([i for i, j in pairs])
+        second = np.array([j for i, j in pairs])
+
+        new_x1, new_y1 = store.new_x[first], store.new_y[first]
+        new_x2, new_y2 = store.new_x[second], store.new_y[second]
+        hit = check_collision_batch(store.pos_x[first], store.pos_y[first], new_x1, new_y1,
+                                    store.pos_x[second], store.pos_y[second], new_x2, new_y2)
+        hit |= np.sqrt((new_x1 - new_x2)**2 + (new_y1 - new_y2)**2) <= 0.5
+
+        for k in np.flatnonzero(hit):
+            i, j = pairs[k]
+            hits[i].append(j)
+            hits[j].append(i)
+
+        return hits
+
+    def is_over(self):
+        return self.game_state == "over"
+
+    def step(self):
+        # play a single turn, returns False once the game is over
+        return self.tick() is not None
+
+    def tick(self):
+        # turn engine shared by the headless loop and the GUI; plays one turn
+        # and returns the per-player trace lines of that turn (empty strings
+        # unless the trace log level is on), or None once the game is over
+        if self.game_state == "over":
+            return None
+
+        # exactly T turns: earlier versions played and logged one more turn,
+        # after the results were final, which never changed the results
+        if self.iteration == self.T:
+            self._finish()
+            return None
+
+        turn_start = time.perf_counter()
+        self.iteration += 1
+        store = self.store
+        store.reset_turn()
+        trace = self.logger.enabled(game_log.TRACE)
+        logs = [""] * store.n
+        prof = self.profiler
+        if prof is not None:
+            prof.start_turn()
+
+        # everything the players print goes to the game's output sink
+        with redirect_stdout(self.player_output):
+            self._play_turn(logs, trace)
+
+        if self.recorder is not None:
+            self.recorder.record(store)
+            if prof is not None:
+                prof.mark("replay")
+        self._log_turn(logs)
+        if prof is not None:
+            prof.mark("logging")
+
+        if self.config.checkpoint is not None and self.config.checkpoint_every > 0 and \
+                self.iteration % self.config.checkpoint_every == 0:
+            self.save_checkpoint(self.config.checkpoint)
+            if prof is not None:
+                prof.mark("checkpoint")
+
+        self.turn_no += 1
+        if prof is not None:
+            prof.end_turn()
+        self.elapsed += time.perf_counter() - turn_start
+        return logs
+
+    def _decide_parallel(self, logs, trace):
+        # every player decides from the start of turn positions at the same
+        # time, see decisions.py; the results are applied in player order
+        store = self.store
+        budget = self.budget
+        calls = []
+        for index in range(store.n):
+            if budget.allowed(index):
+                calls.append(index)
+            else:
+                budget.skipped[index] += 1
+        results = self.decisions.decide(calls, self.player_grid.xs, self.player_grid.ys, self.player_output)
+
+        prof = self.profiler
+        for index in range(store.n):
+            pos_x, pos_y = float(store.pos_x[index]), float(store.pos_y[index])
+            action, new_pos_x, new_pos_y, seconds, _, over_budget = \
+                results.get(index, (None, pos_x, pos_y, 0.0, 0.0, True))
+            self._apply_decision(index, action, new_pos_x, new_pos_y, over_budget, seconds, logs, trace)
+        if prof is not None:
+            # the teams decide at the same time, so their times overlap each
+            # other and are not phases of the turn; the whole parallel phase,
+            # lookups included, is one phase
+            prof.mark("decisions")
+
+    def _apply_decision(self, index, action, new_pos_x, new_pos_y, over_budget, seconds, logs, trace):
+        store = self.store
+        pos_x, pos_y = float(store.pos_x[index]), float(store.pos_y[index])
+        wait = int(store.wait[index])
+        if over_budget:
+            # a player out of time stays where it is
+            action, new_pos_x, new_pos_y = 'move', pos_x, pos_y
+        store.action[index] = ACTIONS.get(action, 0)
+
+        if action == 'lookup':
+            store.interrupt[index] = True
+            store.update_wait[index] = wait != 0
+            if trace:
+                logs[index] = "Time taken: " + str(seconds).ljust(40, " ") + "Action: Lookup"
+
+        elif action == 'move' or action == 'lookup move':
+            if action == 'lookup move':
+                store.interrupt[index] = True
+            if wait == 0:
+                if self.compute_distance(pos_x, pos_y, new_pos_x, new_pos_y) <= 1.0005:
+                    store.new_x[index], store.new_y[index] = new_pos_x, new_pos_y
+                    store.update_move[index] = True
+                    if trace:
+                        logs[index] = "Time taken: " + str(seconds).ljust(
+                            40, " ") + " Action: Move to (" + str(new_pos_x) + ", " + str(new_pos_y) + ")"
+                elif trace:
+                    logs[index] = "Time taken: " + str(seconds).ljust(40, " ") + " Action: Move to (" + str(
+                        new_pos_x) + ", " + str(new_pos_y) + ") Cannot move as distance > 1 unit"
+            else:
+                store.update_wait[index] = True
+                if trace:
+                    logs[index] = "Time taken: " + str(seconds).ljust(40, " ") + " Action: Move to (" + str(
+                        new_pos_x) + ", " + str(new_pos_y) + ") Cannot move as wait time = " + str(wait)
+
+        if over_budget and trace:
+            logs[index] += " Over time budget, stays in place"
+
+        self.decision_time[index] += seconds
+
+    def _decide_serial(self, logs, trace):
+        # every player decides in turn, in player order
+        store = self.store
+        output = self.player_output
+        prof = self.profiler
+        decided = 0.0
+
+        budget = self.budget
+        for index, player in enumerate(self.players):
+            # get player action
+            output.player = index
+            pos_x, pos_y = float(store.pos_x[index]), float(store.pos_y[index])
+            start_time = time.perf_counter()
+            action, new_pos_x, new_pos_y = None, pos_x, pos_y
+            lookup_time = 0.0
+            if budget.allowed(index):
+                with budget.call(index) as call:
+                    action = player.get_action(pos_x, pos_y)
+                    if action == 'lookup' or action == 'lookup move':
+                        lookup_start = time.perf_counter()
+                        other_players, stalls = self.lookup(self.player_states[index])
+                        lookup_time = time.perf_counter() - lookup_start
+                        player.pass_lookup_info(other_players, stalls)
+                    if action == 'move' or action == 'lookup move':
+                        new_pos_x, new_pos_y = player.get_next_move()
+                over_budget = call.exceeded
+            else:
+                budget.skipped[index] += 1
+                over_budget = True
+            end_time = time.perf_counter()
+
+            self._apply_decision(index, action, new_pos_x, new_pos_y, over_budget, end_time - start_time, logs, trace)
+            if prof is not None:
+                # the team's time, without the engine's lookup
+                prof.add("lookup", lookup_time)
+                prof.add("actions team " + str(self.player_states[index].name), end_time - start_time - lookup_time)
+                decided += end_time - start_time
+
+        if prof is not None:
+            prof.mark("actions engine", decided)
+
+    def _play_turn(self, logs, trace):
+        store = self.store
+        output = self.player_output
+        prof = self.profiler
+
+        # start of turn positions, shared by lookup and the collision broad phase
+        self._index_players()
+        if prof is not None:
+            prof.mark("player index")
+
+        if self.decisions is None:
+            self._decide_serial(logs, trace)
+        else:
+            self._decide_parallel(logs, trace)
+
+        # check collision with other players: the pair test is symmetric, so
+        # each nearby pair is tested once and a player that can still move
+        # collides with the lowest indexed player it hits
+        hits = self._player_collisions()
+        for i, player in enumerate(self.player_states):
+            if hits[i] and store.wait[i] == 0:
+                other_player = self.player_states[min(hits[i])]
+                store.update_move[i] = False
+                store.interrupt[i] = True
+                store.wait[i] = 10
+                store.events[i] |= EVENT_PLAYER
+                output.player = i
+                self.players[i].encounter_obstacle()
+                if trace:
+                    logs[i] += " Collided with Player id: " + str(other_player.id) + " name: " + str(
+                        other_player.name) + ": (" + str(float(store.new_x[i])) + ", " + str(float(store.new_y[i])) + ")"
+
+        if prof is not None:
+            prof.mark("player collisions")
+
+        # check collision with obstacles
+        free = store.wait == 0
+        collided = np.zeros(store.n, dtype=bool)
+        for i in np.flatnonzero(free):
+            pos_x, pos_y = float(store.pos_x[i]), float(store.pos_y[i])
+            new_x, new_y = float(store.new_x[i]), float(store.new_y[i])
+            for stall in self.obstacle_grid.near_segment(pos_x, pos_y, new_x, new_y, OBSTACLE_REACH):
+                if self.check_collision_obstacle(stall.id, stall.x, stall.y, pos_x, pos_y, new_x, new_y, self.player_states[i].color):
+                    store.update_move[i] = False
+                    store.events[i] |= EVENT_OBSTACLE
+                    collided[i] = True
+                    if trace:
+                        logs[i] += " Collided with obstacle " + str(stall.id)
+        if prof is not None:
+            prof.mark("obstacle collisions")
+
+        # clamp moves to the board; a move past a corner is clamped on both
+        # axes, otherwise the upper edges take precedence over the lower ones
+        high_x, high_y = store.new_x >= 100, store.new_y >= 100
+        high = high_x | high_y
+        low_x, low_y = ~high & (store.new_x <= 0), ~high & (store.new_y <= 0)
+        boundary = free & (high | low_x | low_y)
+        store.new_x[boundary & high_x] = 100
+        store.new_y[boundary & high_y] = 100
+        store.new_x[boundary & low_x] = 0
+        store.new_y[boundary & low_y] = 0
+        collided |= boundary
+        store.events[boundary] |= EVENT_BOUNDARY
+
+        for i in np.flatnonzero(collided):
+            if trace and boundary[i]:
+                logs[i] += " Collided with boundary"
+            store.wait[i] = 10
+            output.player = i
+            self.players[i].encounter_obstacle()
+        store.interrupt |= collided
+
+        if prof is not None:
+            prof.mark("boundary")
+
+        # collect items
+        for i, player_state in enumerate(self.player_states):
+            if not player_state.unvisited_stalls:
+                continue
+            pos_x, pos_y = float(store.pos_x[i]), float(store.pos_y[i])
+            new_x, new_y = float(store.new_x[i]), float(store.new_y[i])
+            for stall in self.stall_grid.near_segment(pos_x, pos_y, new_x, new_y, STALL_REACH):
+                if stall.id in player_state.unvisited_stalls and self.check_visit_stall(stall.id, stall.x, stall.y, pos_x, pos_y, new_x, new_y,
+                                                                                        player_state.color):
+                    output.player = i
+                    self.players[i].collect_item(stall.id)
+                    player_state.add_stall_visited(stall.id)
+                    store.items[i] += 1
+                    store.events[i] |= EVENT_PICKUP
+                    store.interrupt[i] = True
+                    if trace:
+                        logs[i] += " Collected 1 item from stall " + str(stall.id)
+
+        if prof is not None:
+            prof.mark("items")
+
+        # update positions
+        moved = store.update_move
+        store.pos_x[moved] = store.new_x[moved]
+        store.pos_y[moved] = store.new_y[moved]
+
+        # an interrupted streak of interaction is banked into satisfaction
+        for i in np.flatnonzero(store.interrupt & (store.interaction > 0)):
+            interaction = int(store.interaction[i])
+            store.satisfaction[i] += interaction * math.log2(interaction)
+        store.interaction[store.interrupt] = 0
+        store.interaction[~store.interrupt & (store.wait == 0)] += 1
+
+        if trace:
+            for i in np.flatnonzero(store.update_wait):
+                logs[i] += " wait time is " + str(int(store.wait[i]))
+        store.wait[store.update_wait] -= 1
+        if prof is not None:
+            prof.mark("scoring")
+
+    def run(self, max_turns=None, progress=False):
+        # play until the game is over or max_turns more turns have been played
+        played = 0
+        while max_turns is None or played < max_turns:
+            if not self.step():
+                break
+            played += 1
+            if progress and (self.turn_no - 1) % 100 == 0:
+                print(self.turn_no - 1, end=" ")
+        return self.results()
+
+    def results(self):
+        # final ranking once the game is over, otherwise the ranking so far
+        if self.scores is not None:
+            return self.scores
+
+        results = []
+        for player in self.player_states:
+            satisfaction = player.satisfaction
+            if player.interaction > 0:
+                satisfaction += player.interaction * math.log2(player.interaction)
+            results.append((player.id, player.name, player.items_obtained, satisfaction))
+
+        res = sorted(results, key=lambda element: (element[2], element[3]))
+        return res[::-1]
+
+    def _finish(self):
+        self.game_state = "over"
+        self.scores = self.compute_scores()
+        self._log_results(self.scores)
+        self.logger.write("result.jsonl", json.dumps(game_record(self)) + "\n")
+        if self.profiler is not None:
+            self.logger.write("profile.txt", self.profiler.report())
+        self._log_player_output()
+        self.close()
+
+    def close(self):
+        # flush and close the log files and the replay; called when the game ends
+        self.logger.close()
+        self.budget.close()
+        if self.decisions is not None:
+            with redirect_stdout(self.player_output):
+                self.decisions.close(self.player_output)
+        if self.recorder is not None:
+            self.recorder.close()
+
+    def _log_results(self, scores):
+        self.logger.write("result.txt", self.format_results(scores))
+
+    def format_results(self, scores):
+        s1 = "ID"
+        s2 = "Team"
+        s4 = "Satisfaction"
+        s5 = "Items"
+
+        text = s1.ljust(int(0.4 * self.canvas_scale), " ") + s2.ljust(int(1 * self.canvas_scale), " ") + \
+            s5.ljust(int(1.2 * self.canvas_scale), " ") + s4.ljust(int(1.5 * self.canvas_scale), " ") + "\n"
+
+        for index, score in enumerate(scores):
+            text += str(score[0]).ljust(int(0.4 * self.canvas_scale), " ") + str(score[1]).ljust(int(1 * self.canvas_scale), " ") + (str(score[2]) + "/" + str(
+                len(self.stalls_to_visit))).ljust(int(1.2 * self.canvas_scale), " ") + str(round(score[3], 2)).ljust(int(1.5 * self.canvas_scale), " ") + "\n"
+
+        return text + "\n"
+
+    def _log_player_output(self):
+        f = self.logger.file("player_output.txt")
+        if f is None:
+            return
+
+        output = self.player_output
+        for index, player_state in enumerate(self.player_states):
+            f.write("\nPlayer " + str(player_state.id) + " team " + str(player_state.name) + ": " +
+                    str(output.bytes[index]) + " bytes printed\n")
+            for line in output.lines(index):
+                f.write("    " + line + "\n")
+
+    def _log_turn(self, logs):
+        if self.logger.enabled(game_log.TRACE):
+            for index, name in enumerate(self.player_logs):
+                self.logger.write(name, "TURN " + str(self.turn_no) + ": " + logs[index] + "\n")
+
+        f = self.logger.file("score.txt")
+        if f is not None:
+            s1 = "Player ID"
+            s2 = "Name"
+            s3 = "Interaction"
+            s4 = "Satisfaction"
+            s5 = "Items"
+            f.write("\nTurn No. : " + str(self.turn_no) + "\n")
+            f.write(s1.ljust(int(1.2 * self.canvas_scale), " ") + s2.ljust(int(1 * self.canvas_scale), " ") + s5.ljust(int(1.2 *
+                    self.canvas_scale), " ") + s3.ljust(int(1.5 * self.canvas_scale), " ") + s4.ljust(int(1.5 * self.canvas_scale), " ") + "\n")
+
+            for index, player_state in enumerate(self.player_states):
+                f.write(str(index + 1).ljust(int(1.2 * self.canvas_scale), " ") + str(player_state.name).ljust(int(1 * self.canvas_scale), " ") + (str(player_state.items_obtained) + "/" + str(len(self.stalls_to_visit))).ljust(
+                    int(1.2 * self.canvas_scale), " ") + str(player_state.interaction).ljust(int(1.5 * self.canvas_scale), " ") + str(round(player_state.satisfaction, 2)).ljust(int(1.5 * self.canvas_scale), " ") + "\n")
+
+        self.logger.end_turn(self.turn_no)
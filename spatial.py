@@ -0,0 +1,124 @@
+import math
+
+
+class StaticGrid():
+    """Uniform grid over objects that never move once the map is built.
+
+    Objects only need x and y attributes. Queries return the objects whose
+    centre lies in a box, in the order the objects were given, so callers that
+    replace a full scan with a grid query see the same ordering as before. The
+    returned objects are candidates only; exact geometry is left to the caller.
+    """
+
+    def __init__(self, items, cell_size=5):
+        self.items = list(items)
+        self.cell_size = cell_size
+        self.cells = {}
+        for index, item in enumerate(self.items):
+            key = (math.floor(item.x / cell_size), math.floor(item.y / cell_size))
+            self.cells.setdefault(key, []).append(index)
+
+    def query(self, min_x, min_y, max_x, max_y):
+        c1x, c1y = math.floor(min_x / self.cell_size), math.floor(min_y / self.cell_size)
+        c2x, c2y = math.floor(max_x / self.cell_size), math.floor(max_y / self.cell_size)
+
+        found = []
+        for cx in range(c1x, c2x + 1):
+            for cy in range(c1y, c2y + 1):
+                cell = self.cells.get((cx, cy))
+                if cell is not None:
+                    for index in cell:
+                        item = self.items[index]
+                        if min_x <= item.x <= max_x and min_y <= item.y <= max_y:
+                            found.append(index)
+
+        found.sort()
+        return [self.items[index] for index in found]
+
+    def near_point(self, x, y, radius):
+        return self.query(x - radius, y - radius, x + radius, y + radius)
+
+    def near_segment(self, x1, y1, x2, y2, margin):
+        return self.query(min(x1, x2) - margin, min(y1, y2) - margin, max(x1, x2) + margin, max(y1, y2) + margin)
+
+
+class NeighbourGrid():
+    """Uniform grid over the player positions at the start of a turn.
+
+    It is rebuilt every turn and answers both the lookup radius query and
+    the broad phase of the player collision check. Indices are positions in
+    the xs/ys lists and are always returned in ascending order.
+    """
+
+    def __init__(self, xs, ys, cell_size=5):
+        self.xs = xs
+        self.ys = ys
+        self.cell_size = cell_size
+        self.cells = {}
+        for index in range(len(xs)):
+            key = (math.floor(xs[index] / cell_size), math.floor(ys[index] / cell_size))
+            self.cells.setdefault(key, []).append(index)
+
+    def near_point(self, x, y, radius):
+        c1x, c1y = math.floor((x - radius) / self.cell_size), math.floor((y - radius) / self.cell_size)
+        c2x, c2y = math.floor((x + radius) / self.cell_size), math.floor((y + radius) / self.cell_size)
+
+        found = []
+        for cx in range(c1x, c2x + 1):
+            for cy in range(c1y, c2y + 1):
+                cell = self.cells.get((cx, cy))
+                if cell is not None:
+                    for index in cell:
+                        if abs(self.xs[index] - x) <= radius and abs(self.ys[index] - y) <= radius:
+                            found.append(index)
+
+        found.sort()
+        return found
+
+    def candidate_pairs(self, radius):
+        # every unordered pair (i, j), i < j, whose positions are within radius
+        # of each other on both axes; each pair is produced exactly once
+        span = max(1, math.ceil(radius / self.cell_size))
+        offsets = [(dx, dy) for dx in range(0, span + 1) for dy in range(-span, span + 1)
+                   if dx > 0 or dy > 0]
+
+        pairs = []
+        for (cx, cy), cell in self.cells.items():
+            # pairs inside the cell
+            for a in range(len(cell)):
+                i = cell[a]
+                for b in range(a + 1, len(cell)):
+                    j = cell[b]
+                    if abs(self.xs[i] - self.xs[j]) <= radius and abs(self.ys[i] - self.ys[j]) <= radius:
+                        pairs.append((i, j) if i < j else (j, i))
+
+            # pairs with the cells ahead of this one
+            for dx, dy in offsets:
+                other = self.cells.get((cx + dx, cy + dy))
+                if other is None:
+                    continue
+                for i in cell:
+                    for j in other:
+                        if abs(self.xs[i] - self.xs[j]) <= radius and abs(self.ys[i] - self.ys[j]) <= radius:
+                            pairs.append((i, j) if i < j else (j, i))
+
+        return pairs
+
+
+def lookup(player_grid, obstacle_grid, index, radius):
+    # what player `index` of player_grid sees: the other players as (id, x, y),
+    # where the id of a player is its index + 1, and the obstacles of
+    # obstacle_grid as (id, x, y), within radius
+    x, y = player_grid.xs[index], player_grid.ys[index]
+    other_players, obstacles = [], []
+    for other in player_grid.near_point(x, y, radius):
+        if other != index:
+            other_x, other_y = player_grid.xs[other], player_grid.ys[other]
+            if math.sqrt((other_x - x)**2 + (other_y - y)**2) <= radius:
+                other_players.append((other + 1, other_x, other_y))
+
+    for obstacle in obstacle_grid.near_point(x, y, radius):
+        if math.sqrt((x - obstacle.x)**2 + (y - obstacle.y)**2) <= radius:
+            obstacles.append((obstacle.id, obstacle.x, obstacle.y))
+
+    return other_players, obstacles
@@ -0,0 +1,188 @@
+import signal
+import sys
+import threading
+import time
+
+WALL = "wall"
+CPU = "cpu"
+
+# seconds after which a timer that went off while the player was not running,
+# or that interrupted a player which carried on, goes off again
+RETRY = 0.001
+
+
+class BudgetExceeded(BaseException):
+    # not an Exception, so that a player's `except Exception:` cannot swallow it
+    pass
+
+
+# the timer signals belong to the whole process, and so does their handler:
+# it is installed once while any budget uses a signal, counting the budgets,
+# and passes the signal on to the budget whose call is being timed. Calls
+# are timed on the main thread, one at a time, so at most one is armed
+_timing = None
+_users = {}
+_previous = {}
+
+
+def _alarm(signum, frame):
+    if _timing is not None and _timing._signal == signum:
+        _timing._alarm(signum, frame)
+
+
+def _install(signum):
+    if _users.get(signum, 0) == 0:
+        _previous[signum] = signal.signal(signum, _alarm)
+    _users[signum] = _users.get(signum, 0) + 1
+
+
+def _uninstall(signum):
+    _users[signum] -= 1
+    if _users[signum] == 0:
+        previous = _previous.pop(signum)
+        signal.signal(signum, previous if previous is not None else signal.SIG_DFL)
+
+
+class _Call():
+    def __init__(self, budget, index, preempt):
+        self.budget = budget
+        self.index = index
+        self.preempt = preempt
+        self.exceeded = False
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        budget = self.budget
+        self._armed = False
+        self._start = budget.clock()
+        if budget.preempt and self.preempt:
+            limit = budget.remaining(self.index)
+            if budget.per_call > 0:
+                limit = min(limit, budget.per_call)
+            if limit != float("inf"):
+                # the frame of the with statement, where the player is not
+                # running; a call made while another budget's call is timed
+                # is only checked afterwards
+                self._armed = budget._arm(limit, sys._getframe(1))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # the timer never raises in this module, see TimeBudget._alarm
+        budget = self.budget
+        interrupted = exc_type is BudgetExceeded
+        if self._armed:
+            budget._disarm()
+            interrupted = interrupted or budget._fired
+
+        self.elapsed = budget.clock() - self._start
+        self.exceeded = budget.record(self.index, self.elapsed, interrupted)
+        return exc_type is BudgetExceeded
+
+
+class TimeBudget():
+    """Per call and per game time budgets of the players.
+
+    Every player call goes through call(); a call that takes longer than
+    per_call seconds, or uses up the rest of the player's per_game seconds,
+    is a violation and its result should be discarded. Once the per game
+    budget is used up the player should not be called again. Time is wall
+    clock (perf_counter) or CPU time of the process (process_time). With
+    preempt, on the main thread of a POSIX process, a call is interrupted
+    with an interval timer as soon as it runs out of time, so a player that
+    hangs cannot stall the game; elsewhere budgets are only checked
+    afterwards. A budget of 0 is unlimited.
+    """
+
+    def __init__(self, n, per_call=0, per_game=0, clock=WALL, preempt=True):
+        if clock not in (WALL, CPU):
+            raise ValueError("Time budget clock has to be " + WALL + " or " + CPU)
+
+        self.per_call = per_call
+        self.per_game = per_game
+        self.clock = time.perf_counter if clock == WALL else time.process_time
+        self.preempt = preempt and (per_call > 0 or per_game > 0) and hasattr(signal, "setitimer") and \
+            threading.current_thread() is threading.main_thread()
+        if self.preempt:
+            self._timer = signal.ITIMER_REAL if clock == WALL else signal.ITIMER_PROF
+            self._signal = signal.SIGALRM if clock == WALL else signal.SIGPROF
+        self._armed = False
+        self._fired = False
+        self._caller = None
+        self._installed = False
+
+        # seconds used, calls over budget and turns skipped, per player
+        self.used = [0.0] * n
+        self.violations = [0] * n
+        self.skipped = [0] * n
+
+    def remaining(self, index):
+        if self.per_game <= 0:
+            return float("inf")
+        return self.per_game - self.used[index]
+
+    def allowed(self, index):
+        return self.remaining(index) > 0
+
+    def call(self, index, preempt=True):
+        # preempt=False only checks the call afterwards, for calls that are
+        # not made on the main thread
+        return _Call(self, index, preempt)
+
+    def record(self, index, elapsed, interrupted=False):
+        # charge a call of elapsed seconds to a player, also for calls timed
+        # elsewhere such as in a worker process; True if it was over budget
+        self.used[index] += elapsed
+        if interrupted or (self.per_call > 0 and elapsed > self.per_call) or self.remaining(index) <= 0:
+            self.violations[index] += 1
+            return True
+        return False
+
+    def _alarm(self, signum, frame):
+        # only raises inside the player: in the frame of the with statement the
+        # player is not running (it is between two calls of the player, or has
+        # returned), so the timer goes off again shortly, and in this module
+        # the call is being timed out anyway
+        if not self._armed:
+            return
+        self._fired = True
+        signal.setitimer(self._timer, RETRY)
+        if frame is self._caller or (frame is not None and frame.f_code.co_filename == __file__):
+            return
+        # a player that catches it is interrupted again until it returns
+        raise BudgetExceeded()
+
+    def _arm(self, seconds, caller):
+        # False if another budget's call is being timed
+        global _timing
+        if _timing is not None:
+            return False
+        if not self._installed:
+            _install(self._signal)
+            self._installed = True
+        self._caller = caller
+        self._fired = False
+        self._armed = True
+        _timing = self
+        signal.setitimer(self._timer, max(seconds, 1e-6))
+        return True
+
+    def _disarm(self):
+        # with the signal blocked, so that it cannot go off half way; a signal
+        # that is pending goes off when it is unblocked and is ignored
+        global _timing
+        if _timing is not self:
+            return
+        signal.pthread_sigmask(signal.SIG_BLOCK, [self._signal])
+        try:
+            signal.setitimer(self._timer, 0)
+            self._armed = False
+            self._caller = None
+            _timing = None
+        finally:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, [self._signal])
+
+    def close(self):
+        if self._installed:
+            self._disarm()
+            _uninstall(self._signal)
+            self._installed = False
@@ -1,3 +1,13 @@
+import argparse
+from itertools import chain
+import multiprocessing
+import os
+import time
+import traceback
+
+from game_results import append_record, error_record, game_record
+from result_cache import ResultCache
+
 no_of_stalls = [2, 3, 20, 30, 100]
 no_of_obstacles = [0, 50, 200]
 players = ['1 2 3 4 5 6',\
@@ -24,53 +34,124 @@ players = ['1 2 3 4 5 6',\
 
 theta = [1, 2, 3]
 
-with open('tournament_1.sh', 'w') as f:
-    f.write('start=$(date +%s)\n')
-
-with open('tournament_2.sh', 'w') as f:
-    f.write('start=$(date +%s)\n')
-
-with open('tournament_3.sh', 'w') as f:
-    f.write('start=$(date +%s)\n')
-
-total = len(no_of_stalls) * len(no_of_obstacles) * len(players) * len(theta)
-count = 0
-for p in players:
-    for nv in no_of_stalls:
-        for no in no_of_obstacles:
-            for t in theta:
-                count += 1
-                with open('tournament_1.sh', 'a') as f:
-                    f.write('echo -e "\n\nRun ' + str(count) + '/' + str(total) + '"' + '\n')
-                    f.write('python3 main.py --gui False -ns ' + str(nv + no) + ' -nv ' + str(nv) + ' -p ' + str(p) + ' --theta ' + str(t) + " --seed 5\n")
-                    f.write('cat logs/game_config.txt >> tournament_results.txt\n')
-                    f.write('cat logs/result.txt >> tournament_results.txt\n')
-count = 0
-for p in players:
-    for nv in no_of_stalls:
-        for no in no_of_obstacles:
-            for t in theta:
-                with open('tournament_2.sh', 'a') as f:
-                    f.write('echo -e "\n\nRun ' + str(count) + '/' + str(total) + '"' + '\n')
-                    f.write('python3 main.py --gui False -ns ' + str(nv + no) + ' -nv ' + str(nv) + ' -p ' + str(p) + ' --theta ' + str(t) + " --seed 2\n")
-                    f.write('cat logs/game_config.txt >> tournament_results.txt\n')
-                    f.write('cat logs/result.txt >> tournament_results.txt\n')
-count = 0
-for p in players:
-    for nv in no_of_stalls:
-        for no in no_of_obstacles:
-            for t in theta:
-                with open('tournament_3.sh', 'a') as f:
-                    f.write('echo -e "\n\nRun ' + str(count) + '/' + str(total) + '"' + '\n')
-                    f.write('python3 main.py --gui False -ns ' + str(nv + no) + ' -nv ' + str(nv) + ' -p ' + str(p) + ' --theta ' + str(t) + " --seed 3\n")
-                    f.write('cat logs/game_config.txt >> tournament_results.txt\n')
-                    f.write('cat logs/result.txt >> tournament_results.txt\n')
-
-with open('tournament_1.sh', 'a') as f:
-    f.write('end=$(date +%s)\necho "Elapsed Time: $(($end-$start)) seconds" >> time.txt')
-
-with open('tournament_2.sh', 'a') as f:
-    f.write('end=$(date +%s)\necho "Elapsed Time: $(($end-$start)) seconds" >> time.txt')
-
-with open('tournament_3.sh', 'a') as f:
-    f.write('end=$(date +%s)\necho "Elapsed Time: $(($end-$start)) seconds" >> time.txt')
+seeds = [5, 2, 3]
+
+# what decides the outcome of a game
+GAME_KEYS = ("seed", "no_of_stalls", "no_to_visit", "players", "theta", "layout")
+
+
+def tournament_games(seeds, layout="grid"):
+    # the games of the tournament, in the order of the old tournament scripts
+    games = []
+    for seed in seeds:
+        for p in players:
+            for nv in no_of_stalls:
+                for no in no_of_obstacles:
+                    for t in theta:
+                        games.append({"index": len(games) + 1, "seed": seed, "no_of_stalls": nv + no,
+                                      "no_to_visit": nv, "players": p.split(), "theta": t, "layout": layout})
+    return games
+
+
+_world_cache = None
+
+
+def _init_worker(world_cache=None):
+    # import the engine once per worker, not once per game; teams are
+    # imported by the first game that uses them and then stay loaded
+    global _world_cache
+    import simulation
+    _world_cache = world_cache
+
+
+def play_game(game):
+    from simulation import GameConfig, Simulation
+
+    start = time.perf_counter()
+    result = dict(game)
+    try:
+        sim = Simulation(GameConfig(no_of_stalls=game["no_of_stalls"], no_to_visit=game["no_to_visit"],
+                                    theta=game["theta"], players=game["players"], seed=game["seed"],
+                                    layout=game["layout"], world_cache=_world_cache))
+        scores = sim.run()
+        result["T"] = sim.T
+        result["scores"] = scores
+        result["text"] = sim.format_config() + sim.format_results(scores)
+        result["record"] = game_record(sim)
+    except Exception:
+        result["error"] = traceback.format_exc()
+        result["record"] = error_record({key: game[key] for key in GAME_KEYS}, result["error"])
+    result["time"] = time.perf_counter() - start
+    result["record"]["index"] = game["index"]
+    return result
+
+
+def game_key(cache, game):
+    return cache.key({key: game[key] for key in GAME_KEYS})
+
+
+def run_tournament(games, workers, output, results=None, cache=None, world_cache=None):
+    # games already in the cache are reported straight away; the others are
+    # handed out biggest first so that no worker is left with a long game at
+    # the end, and their results are written as soon as they arrive. Maps and
+    # reference tours only depend on the seed and the numbers of stalls, so
+    # the games of other players and thetas load them from world_cache
+    start = time.perf_counter()
+    failed = 0
+    cached = []
+    order = []
+    for game in games:
+        result = cache.get(game_key(cache, game)) if cache is not None else None
+        if result is not None:
+            result["record"]["index"] = result["index"] = game["index"]
+            cached.append(result)
+        else:
+            order.append(game)
+    order.sort(key=lambda game: len(game["players"]) * game["no_of_stalls"] * game["theta"], reverse=True)
+    if cache is not None:
+        print(str(len(cached)) + " of " + str(len(games)) + " games found in the cache")
+
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(world_cache,)) as pool, open(output, "a") as f:
+        played = pool.imap_unordered(play_game, order)
+        for done, result in enumerate(chain(cached, played), 1):
+            if cache is not None and "error" not in result and done > len(cached):
+                cache.put(game_key(cache, result), result)
+            f.write("\n\nRun " + str(result["index"]) + " (seed " + str(result["seed"]) + ")\n")
+            if "error" in result:
+                failed += 1
+                f.write("\nGame Configuration\nTotal Number of Stalls: " + str(result["no_of_stalls"]) +
+                        "\nNumber of Stalls to Visit: " + str(result["no_to_visit"]) + "\nPlayers: " +
+                        str(result["players"]) + "\nTheta: " + str(result["theta"]) + "\n\nERROR\n" + result["error"])
+            else:
+                f.write(result["text"])
+            f.flush()
+            if results is not None:
+                append_record(results, result["record"])
+            print("Run " + str(done) + "/" + str(len(games)) + " " + str(round(result["time"], 2)) + "s", flush=True)
+
+    elapsed = time.perf_counter() - start
+    print("Elapsed Time: " + str(round(elapsed, 2)) + " seconds, " + str(failed) + " games failed")
+    return elapsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", "-w", default=os.cpu_count(), help="Number of games played at the same time")
+    parser.add_argument("--seeds", default=seeds, nargs="+", help="Seeds to play the tournament with")
+    parser.add_argument("--layout", default="grid", choices=["grid", "legacy"],
+                        help="How stalls are placed: grid, or legacy for the maps of earlier versions")
+    parser.add_argument("--output", "-o", default="tournament_results.txt", help="File the results are appended to")
+    parser.add_argument("--results", "-r", default="tournament_results.jsonl",
+                        help="File one record per game is appended to, as CSV if the name ends in .csv, else JSON Lines")
+    parser.add_argument("--cache", default=os.path.join(".cache", "tournament"),
+                        help="Directory of the result cache, games whose configuration and code are unchanged are not played again")
+    parser.add_argument("--world_cache", default=os.path.join(".cache", "worlds"),
+                        help="Directory of the generated maps and their reference tours, shared by all games on the same map")
+    parser.add_argument("--no_cache", action="store_true", help="Play every game, without reading or writing the caches")
+    parser.add_argument("--cache_size", default=20000, help="Maximum number of games kept in the cache")
+    args = parser.parse_args()
+
+    cache = None if args.no_cache else ResultCache(args.cache, int(args.cache_size))
+    world_cache = None if args.no_cache else args.world_cache
+    games = tournament_games([int(seed) for seed in args.seeds], args.layout)
+    run_tournament(games, int(args.workers), args.output, args.results, cache, world_cache)
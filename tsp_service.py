@@ -0,0 +1,169 @@
+import numpy as np
+
+# tours through at most EXACT_STALLS stalls are solved exactly; longer ones
+# start from the nearest neighbour tour and are improved by at most
+# IMPROVE_PASSES passes of 2-opt and or-opt, so a tour only depends on the
+# distances, never on how long the solver was allowed to run
+EXACT_STALLS = 12
+IMPROVE_PASSES = 25
+# an improvement has to save more than this, so rounding cannot cycle
+EPSILON = 1e-9
+
+
+def solve_tour(dist_matrix, int_matrix=None):
+    # a short closed tour through every point of dist_matrix, as a list of
+    # indices; int_matrix is dist_matrix rounded up, the input fast_tsp takes
+    n = len(dist_matrix)
+    if n < 3:
+        return list(range(n))
+
+    import fast_tsp
+
+    if int_matrix is None:
+        int_matrix = np.ceil(dist_matrix).astype(np.int64)
+    if n <= EXACT_STALLS:
+        return [int(i) for i in fast_tsp.solve_tsp_exact(int_matrix)]
+
+    tour = np.array(fast_tsp.greedy_nearest_neighbor(int_matrix))
+    for _ in range(IMPROVE_PASSES):
+        tour, reversed_ = _two_opt(dist_matrix, tour)
+        tour, moved = _or_opt(dist_matrix, tour)
+        if not reversed_ and not moved:
+            break
+    return [int(i) for i in tour]
+
+
+def _two_opt(dist_matrix, tour):
+    # one pass: for every edge (a, b) in turn, replace it and the edge (c, e)
+    # that saves the most by (a, c) and (b, e), reversing the path b ... c
+    n = len(tour)
+    improved = False
+    for i in range(n - 2):
+        a, b = tour[i], tour[i + 1]
+        c = tour[i + 2:]
+        e = np.append(tour[i + 3:], tour[0])
+        gain = dist_matrix[a, b] + dist_matrix[c, e] - dist_matrix[a, c] - dist_matrix[b, e]
+        if i == 0:
+            # the last edge closes the loop at a
+            gain[-1] = 0.0
+        k = int(np.argmax(gain))
+        if gain[k] > EPSILON:
+            tour[i + 1:i + k + 3] = tour[i + 1:i + k + 3][::-1].copy()
+            improved = True
+    return tour, improved
+
+
+def _or_opt(dist_matrix, tour):
+    # one pass: move every run of 1 to 3 stalls, either way round, to the
+    # edge where it costs the least, if that is cheaper than where it is
+    n = len(tour)
+    improved = False
+    for length in (1, 2, 3):
+        following = np.roll(tour, -1)
+        edges = dist_matrix[tour, following]
+        for i in range(n):
+            positions = np.arange(i, i + length) % n
+            run = tour[positions]
+            first, last = run[0], run[-1]
+            p, q = tour[i - 1], tour[(i + length) % n]
+            saved = dist_matrix[p, first] + dist_matrix[last, q] - dist_matrix[p, q]
+            # inserted between tour[k] and following[k], on an edge away from the run
+            forwards = dist_matrix[first][tour] + dist_matrix[last][following] - edges
+            backwards = dist_matrix[last][tour] + dist_matrix[first][following] - edges
+            near = np.arange(i - 1, i + length) % n
+            forwards[near] = np.inf
+            backwards[near] = np.inf
+            k, j = int(np.argmin(forwards)), int(np.argmin(backwards))
+            if backwards[j] < forwards[k]:
+                cost, k, run = backwards[j], j, run[::-1]
+            else:
+                cost = forwards[k]
+            if saved - cost > EPSILON:
+                keep = np.ones(n, dtype=bool)
+                keep[positions] = False
+                at = int(np.count_nonzero(keep[:k + 1]))
+                rest = tour[keep]
+                tour = np.concatenate([rest[:at], run, rest[at:]])
+                following = np.roll(tour, -1)
+                edges = dist_matrix[tour, following]
+                improved = True
+    return tour, improved
+
+
+class TspService():
+    """Distances and tours of the stalls to visit, shared by all players of a game.
+
+    The engine builds one service per game and hands it to every player
+    that takes a tsp_service argument. Tours are lists of indices into
+    stalls_to_visit. A tour through a set of stalls is solved once and
+    remembered; a tour from a start position is that tour, cut open where
+    going from the start is cheapest, so every player of a game gets a
+    tour from its own position in linear time instead of a solve of its
+    own. The distance matrices are read-only and must not be modified.
+    """
+
+    def __init__(self, stalls_to_visit, dist_matrix, tour=None):
+        self.stalls_to_visit = stalls_to_visit
+        self.dist_matrix = dist_matrix
+        self.x = np.array([stall.x for stall in stalls_to_visit], dtype=float)
+        self.y = np.array([stall.y for stall in stalls_to_visit], dtype=float)
+        self._int_matrix = None
+        self._tours = {}
+        self._open_tours = {}
+        if tour is not None and len(tour) == len(stalls_to_visit):
+            # the engine's reference tour, through every stall
+            self._tours[frozenset(range(len(stalls_to_visit)))] = list(tour)
+
+    def distances(self):
+        # distances between the stalls to visit
+        return self.dist_matrix
+
+    def int_distances(self):
+        # the distances rounded up, the input fast_tsp takes
+        if self._int_matrix is None:
+            self._int_matrix = np.ceil(self.dist_matrix).astype(np.int64)
+            self._int_matrix.flags.writeable = False
+        return self._int_matrix
+
+    def tour(self, start=None, stalls=None):
+        # a short tour through the stalls with these indices (all by default),
+        # as a closed loop, or from start (an (x, y) position) to the last stall
+        key = frozenset(range(len(self.stalls_to_visit)) if stalls is None else stalls)
+        if start is None:
+            return list(self._loop(key))
+
+        start = (float(start[0]), float(start[1]))
+        if (start, key) not in self._open_tours:
+            self._open_tours[(start, key)] = self._cut(self._loop(key), start)
+        return list(self._open_tours[(start, key)])
+
+    def _loop(self, key):
+        if key not in self._tours:
+            # the same heuristic as the reference tour: bounded, and the same
+            # for the same stalls however long it takes
+            indices = sorted(key)
+            selection = np.ix_(indices, indices)
+            loop = solve_tour(self.dist_matrix[selection], self.int_distances()[selection])
+            self._tours[key] = [indices[i] for i in loop]
+        return self._tours[key]
+
+    def _cut(self, loop, start):
+        # leave out the edge of the loop whose removal, together with the way
+        # from start to the stall after (or before) it, costs the least
+        if len(loop) < 2:
+            return list(loop)
+
+        loop = np.array(loop)
+        following = np.roll(loop, -1)
+        edge = self.dist_matrix[loop, following]
+        from_start = np.hypot(self.x[loop] - start[0], self.y[loop] - start[1])
+        # forwards: start -> loop[k + 1] -> ... -> loop[k]
+        forwards = np.roll(from_start, -1) - edge
+        # backwards: start -> loop[k] -> ... -> loop[k + 1]
+        backwards = from_start - edge
+
+        k = int(np.argmin(forwards))
+        if backwards.min() < forwards[k]:
+            k = int(np.argmin(backwards))
+            return [int(i) for i in np.roll(loop[::-1], k + 1 - len(loop))]
+        return [int(i) for i in np.roll(loop, -(k + 1))]
@@ -0,0 +1,77 @@
+import json
+import os
+
+# world file layout: one JSON object
+#   version      WORLD_VERSION
+#   stalls       [[id, x, y], ...], the centres of all stalls
+#   visit        ids of the stalls to visit, in order; the other stalls are obstacles
+#   tour         optional, the reference tour as indices into visit
+#   tour_length  optional, the length of the tour without the way back, T is
+#                theta times this length rounded up
+# cache entries also hold random_state, the state of the random module after
+# the world was generated, so that a game on a cached world goes on exactly
+# like one on a generated world
+WORLD_VERSION = 1
+
+
+def world_key(config):
+    # what a generated world depends on, as a result_cache.ResultCache config
+    return {"world": WORLD_VERSION, "seed": config.seed, "no_of_stalls": config.no_of_stalls,
+            "no_to_visit": config.no_to_visit, "layout": config.layout, "disable_tsp": config.disable_tsp}
+
+
+def world_data(sim, random_state=None):
+    data = {
+        "version": WORLD_VERSION,
+        "stalls": [[stall.id, stall.x, stall.y] for stall in sim.stalls],
+        "visit": [stall.id for stall in sim.stalls_to_visit],
+    }
+    if not sim.config.disable_tsp:
+        data["tour"] = [int(i) for i in sim.tsp_path]
+        data["tour_length"] = sim.tour_length
+    if random_state is not None:
+        data["random_state"] = [random_state[0], list(random_state[1]), random_state[2]]
+    return data
+
+
+def save_world(path, data):
+    with open(path + ".tmp", "w") as f:
+        json.dump(data, f)
+    os.replace(path + ".tmp", path)
+
+
+def load_world(path):
+    # a world file, checked; raises OSError or ValueError
+    with open(path) as f:
+        data = json.load(f)
+    check_world(data)
+    return data
+
+
+def check_world(data):
+    if not isinstance(data, dict) or data.get("version") != WORLD_VERSION:
+        raise ValueError("Unsupported world file version")
+    try:
+        ids = [int(id) for id, x, y in data["stalls"]]
+        for id, x, y in data["stalls"]:
+            float(x), float(y)
+        visit = [int(id) for id in data["visit"]]
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("A world needs stalls as [id, x, y] lists and the ids of the stalls to visit")
+    if len(set(ids)) != len(ids):
+        raise ValueError("Stall ids of a world have to be unique")
+    if not visit or len(set(visit)) != len(visit) or not set(visit) <= set(ids):
+        raise ValueError("The stalls to visit have to be distinct stalls of the world")
+    if "tour" in data:
+        if sorted(data["tour"]) != list(range(len(visit))):
+            raise ValueError("The tour of a world has to visit every stall to visit once")
+        if not isinstance(data.get("tour_length"), (int, float)):
+            raise ValueError("A world with a tour needs its tour_length")
+
+
+def random_state(data):
+    # the random module state saved with a cache entry, None for world files
+    if "random_state" not in data:
+        return None
+    version, state, gauss = data["random_state"]
+    return (version, tuple(state), gauss)